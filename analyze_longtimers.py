@@ -1,7 +1,6 @@
 """
 Deep analysis of long-timer authors — what do they do differently?
 """
-import sqlite3
 import os
 import sys
 import json
@@ -10,9 +9,9 @@ from collections import defaultdict
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 LONGTIMER_THRESHOLD = 20  # min snapshots in top-20
 
@@ -3,7 +3,11 @@ Behance Analyzer — Statistical analysis, correlations, gap analysis.
 """
 import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
 
 import pandas as pd
 import numpy as np
@@ -26,84 +30,103 @@ def load_latest_snapshot(query: str) -> pd.DataFrame | None:
     if not snapshots:
         return None
 
-    latest = snapshots[0]
-    results = db.get_search_results_for_snapshot(latest["id"])
+    df = _load_snapshot(snapshots[0]["id"])
+    return None if df is None else df.copy()
+
+
+@lru_cache(maxsize=32)
+def _load_snapshot(snapshot_id: int) -> pd.DataFrame | None:
+    """
+    Enriched results of one snapshot. Memoized by snapshot id, so a new
+    scrape (new snapshot) is never served from cache; callers get copies.
+    """
+    results = db.get_search_results_columns(snapshot_id)
     if not results:
         return None
 
     df = pd.DataFrame(results)
 
-    conn = db.get_connection()
+    conn = db.get_shared_connection()
 
-    # Enrich with author stats
-    author_stats = []
-    for _, row in df.iterrows():
-        if row.get("author_id"):
-            astats = db.get_author_stats_latest(row["author_id"])
-            author_stats.append(astats or {})
-        else:
-            author_stats.append({})
-
-    ast_df = pd.DataFrame(author_stats)
-    if not ast_df.empty:
+    # Enrich with author stats (latest snapshot per author, single query)
+    author_ids = [int(a) for a in df["author_id"].dropna().unique()]
+    ast_rows = db.get_author_stats_latest_many(author_ids)
+    if ast_rows:
+        ast_df = pd.DataFrame(ast_rows).set_index("author_id")
         for col in ["total_views", "total_appreciations", "followers", "following", "project_count"]:
-            if col in ast_df.columns:
-                df[f"author_{col}"] = ast_df[col].values
-
-    # Enrich with tags
-    tag_counts = []
-    for _, row in df.iterrows():
-        tags = conn.execute(
-            "SELECT tag_name FROM project_tags WHERE project_id = ?",
-            (row["project_id"],),
-        ).fetchall()
-        tag_counts.append(len(tags))
-    df["tag_count"] = tag_counts
-
-    conn.close()
-
-    # Computed metrics
-    today = datetime.utcnow()
+            df[f"author_{col}"] = df["author_id"].map(ast_df[col])
+
+    # Enrich with tags (one GROUP BY for the whole snapshot)
+    project_ids = [int(p) for p in df["project_id"].unique()]
+    placeholders = ", ".join("?" for _ in project_ids)
+    tag_rows = conn.execute(f"""
+        SELECT project_id, COUNT(*) AS n FROM project_tags
+        WHERE project_id IN ({placeholders})
+        GROUP BY project_id
+    """, project_ids).fetchall()
+    tag_counts = {r["project_id"]: r["n"] for r in tag_rows}
+    df["tag_count"] = df["project_id"].map(tag_counts).fillna(0).astype(int)
+
+    # engagement_rate / *_per_day are stored per search result at ingest
     if "published_date" in df.columns:
-        df["days_since_publish"] = df["published_date"].apply(
-            lambda x: (today - datetime.strptime(x, "%Y-%m-%d")).days
-            if x and isinstance(x, str) else None
-        )
-        df["appreciations_per_day"] = df.apply(
-            lambda r: r["appreciations"] / max(r["days_since_publish"], 1)
-            if r["days_since_publish"] and r["days_since_publish"] > 0 else 0,
-            axis=1,
-        )
-        df["views_per_day"] = df.apply(
-            lambda r: r["views"] / max(r["days_since_publish"], 1)
-            if r["days_since_publish"] and r["days_since_publish"] > 0 else 0,
-            axis=1,
-        )
-
-    df["engagement_rate"] = df.apply(
-        lambda r: r["appreciations"] / max(r["views"], 1) if r["views"] > 0 else 0,
-        axis=1,
-    )
+        df["days_since_publish"] = _days_since_publish(df["published_date"])
 
-    return df
+    return _downcast_numeric(df)
 
 
 def load_my_projects_df() -> pd.DataFrame:
-    projects = db.get_my_projects()
-    if not projects:
+    df = pd.DataFrame(db.iter_my_projects())
+    if df.empty:
         return pd.DataFrame()
-    df = pd.DataFrame(projects)
 
-    today = datetime.utcnow()
     if "published_date" in df.columns:
-        df["days_since_publish"] = df["published_date"].apply(
-            lambda x: (today - datetime.strptime(x, "%Y-%m-%d")).days
-            if x and isinstance(x, str) else None
-        )
+        df["days_since_publish"] = _days_since_publish(df["published_date"])
 
     return df
 
 
+# "#" bars for |r| * 20, indexed 0..20
+_CORR_BARS = ["#" * i for i in range(21)]
+
+_COUNT_COLUMNS = [
+    "position", "appreciations", "views", "comments", "module_count",
+    "image_count", "video_count", "description_length", "tag_count",
+    "co_owners_count", "external_link_count", "is_promoted", "is_featured",
+]
+_RATE_COLUMNS = [
+    "engagement_rate", "appreciations_per_day", "views_per_day",
+    "title_keyword_match",
+]
+
+
+def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink counts to the smallest int and rates to float32 (less memory per pass)."""
+    for col in _COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in _RATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast="float")
+    return df
+
+
+def _json_list(value) -> list:
+    """Decode a JSON array column value; already-parsed lists pass through."""
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _days_since_publish(published: pd.Series) -> pd.Series:
+    """Whole days from 'YYYY-MM-DD' publish dates to now (NaN if missing)."""
+    pub = pd.to_datetime(published, format="%Y-%m-%d", errors="coerce")
+    return (pd.Timestamp(datetime.utcnow()) - pub).dt.days
+
+
 # ---------------------------------------------------------------------------
 # Descriptive statistics
 # ---------------------------------------------------------------------------
@@ -139,15 +162,13 @@ def descriptive_stats(df: pd.DataFrame, query: str) -> str:
         lines.append("")
 
     # Top tags
-    conn = db.get_connection()
-    all_tags = []
-    for _, row in df.iterrows():
-        tags = conn.execute(
-            "SELECT tag_name FROM project_tags WHERE project_id = ?",
-            (row["project_id"],),
-        ).fetchall()
-        all_tags.extend([t["tag_name"] for t in tags])
-    conn.close()
+    conn = db.get_shared_connection()
+    project_ids = [int(p) for p in df["project_id"].unique()]
+    placeholders = ", ".join("?" for _ in project_ids)
+    all_tags = [t["tag_name"] for t in conn.execute(
+        f"SELECT tag_name FROM project_tags WHERE project_id IN ({placeholders})",
+        project_ids,
+    ).fetchall()]
 
     if all_tags:
         tag_series = pd.Series(all_tags)
@@ -180,15 +201,10 @@ def descriptive_stats(df: pd.DataFrame, query: str) -> str:
 
     # Tools distribution
     if "tools_used" in df.columns:
-        tools_all = []
-        for t in df["tools_used"].dropna():
-            try:
-                tools_all.extend(json.loads(t))
-            except (json.JSONDecodeError, TypeError):
-                pass
-        if tools_all:
+        tools_all = df["tools_used"].dropna().map(_json_list).explode().dropna().rename(None)
+        if not tools_all.empty:
             lines.append("--- Tools Distribution ---")
-            lines.append(pd.Series(tools_all).value_counts().head(10).to_string())
+            lines.append(tools_all.value_counts().head(10).to_string())
             lines.append("")
 
     # Pro accounts
@@ -206,10 +222,12 @@ def descriptive_stats(df: pd.DataFrame, query: str) -> str:
             lines.append(f"  Max: {age.max():.0f} days")
             lines.append(f"  Median: {age.median():.0f} days")
             lines.append(f"  Mean: {age.mean():.0f} days")
-            lines.append(f"  < 7 days: {(age < 7).sum()} projects")
-            lines.append(f"  7-30 days: {((age >= 7) & (age < 30)).sum()} projects")
-            lines.append(f"  30-90 days: {((age >= 30) & (age < 90)).sum()} projects")
-            lines.append(f"  90+ days: {(age >= 90).sum()} projects")
+            bucket_labels = ["< 7 days", "7-30 days", "30-90 days", "90+ days"]
+            buckets = pd.cut(
+                age, bins=[-np.inf, 7, 30, 90, np.inf], right=False, labels=bucket_labels,
+            ).value_counts(sort=False)
+            for bucket_label in bucket_labels:
+                lines.append(f"  {bucket_label}: {buckets[bucket_label]} projects")
         lines.append("")
 
     return "\n".join(lines)
@@ -257,20 +275,25 @@ def correlation_analysis(df: pd.DataFrame, query: str) -> str:
         ("author_project_count", "Author Project Count"),
     ]
 
+    # Rank every factor once and correlate them all in a single pass;
+    # pandas drops NaN pairwise, like spearmanr on each dropna() subset.
+    cols = [col for col, _ in factors if col in df.columns]
+    sub = df[[target] + cols].apply(pd.to_numeric, errors="coerce")
+    corrs = sub.corr(method="spearman")[target]
+    counts = sub[cols].notna().mul(sub[target].notna(), axis=0).sum()
+
+    # Two-sided p-value from the t-distribution, as scipy's spearmanr does
+    dof = counts - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = corrs[cols] * np.sqrt(dof / ((1 - corrs[cols]) * (1 + corrs[cols])))
+    pvals = 2 * scipy_stats.t.sf(np.abs(t_stat), dof)
+    pvals = pd.Series(pvals, index=cols)
+
     results = []
     for col, label in factors:
-        if col not in df.columns:
+        if col not in cols or counts[col] < 5 or np.isnan(corrs[col]):
             continue
-        valid = df[[target, col]].dropna()
-        if len(valid) < 5:
-            continue
-        try:
-            corr, pval = scipy_stats.spearmanr(valid[target], valid[col])
-            if np.isnan(corr):
-                continue
-            results.append((label, col, corr, pval))
-        except Exception:
-            pass
+        results.append((label, col, corrs[col], pvals[col]))
 
     results.sort(key=lambda x: abs(x[2]), reverse=True)
 
@@ -289,7 +312,7 @@ def correlation_analysis(df: pd.DataFrame, query: str) -> str:
         else:
             strength = "NONE"
 
-        bar = "#" * int(abs_corr * 20)
+        bar = _CORR_BARS[int(abs_corr * 20)]
         sig = "*" if pval < 0.05 else ""
         direction = "(-)" if corr < 0 else "(+)"
 
@@ -318,10 +341,7 @@ def gap_analysis(df: pd.DataFrame, my_df: pd.DataFrame, query: str) -> str:
         lines.append("No projects found for your profile.")
         return "\n".join(lines)
 
-    # Split into tiers
     top10 = df[df["position"] <= 10]
-    top20 = df[df["position"] <= 20]
-    top50 = df[df["position"] <= 50]
 
     metrics = [
         ("appreciations", "Appreciations"),
@@ -342,14 +362,26 @@ def gap_analysis(df: pd.DataFrame, my_df: pd.DataFrame, query: str) -> str:
     lines.append(f"{'Metric':<25} {'Top-10':>10} {'Top-20':>10} {'Top-50':>10} {'You (avg)':>10} {'Status':>8}")
     lines.append("-" * 78)
 
+    # Tier means for every metric at once (one pass per tier, not per metric)
+    metric_cols = [col for col, _ in metrics if col in df.columns]
+    values = df[metric_cols].apply(pd.to_numeric, errors="coerce")
+    tier_means = {
+        k: values[df["position"] <= k].mean().fillna(0) for k in (10, 20, 50)
+    }
+    my_cols = [col for col in metric_cols if col in my_df.columns]
+    my_means = (
+        my_df[my_cols].apply(pd.to_numeric, errors="coerce").mean()
+        .reindex(metric_cols).fillna(0)
+    )
+
     for col, label in metrics:
         if col not in df.columns:
             continue
 
-        t10_avg = top10[col].mean() if col in top10.columns and not top10[col].isna().all() else 0
-        t20_avg = top20[col].mean() if col in top20.columns and not top20[col].isna().all() else 0
-        t50_avg = top50[col].mean() if col in top50.columns and not top50[col].isna().all() else 0
-        my_avg = my_df[col].mean() if col in my_df.columns and not my_df[col].isna().all() else 0
+        t10_avg = tier_means[10][col]
+        t20_avg = tier_means[20][col]
+        t50_avg = tier_means[50][col]
+        my_avg = my_means[col]
 
         if t10_avg > 0:
             ratio = my_avg / t10_avg
@@ -371,13 +403,15 @@ def gap_analysis(df: pd.DataFrame, my_df: pd.DataFrame, query: str) -> str:
 
     # My projects presence in search
     lines.append("--- Your Projects in Search Results ---")
-    my_behance_ids = set(my_df["behance_id"].tolist()) if "behance_id" in my_df.columns else set()
+    my_behance_ids = my_df["behance_id"].dropna() if "behance_id" in my_df.columns else pd.Series(dtype=object)
 
-    if my_behance_ids and "behance_id" in df.columns:
-        found = df[df["behance_id"].isin(my_behance_ids)]
+    if not my_behance_ids.empty and "behance_id" in df.columns:
+        found = df.loc[df["behance_id"].isin(my_behance_ids), ["position", "title"]].sort_values("position")
         if not found.empty:
-            for _, row in found.iterrows():
-                lines.append(f"  FOUND at #{row['position']}: {row.get('title', 'N/A')}")
+            lines.extend(
+                f"  FOUND at #{pos}: {title or 'N/A'}"
+                for pos, title in zip(found["position"].to_numpy(), found["title"].to_numpy())
+            )
         else:
             lines.append("  NONE of your projects found in search results")
     else:
@@ -420,19 +454,24 @@ def trend_analysis(query: str) -> str:
         return "\n".join(lines)
 
     # Track projects across snapshots
-    conn = db.get_connection()
+    conn = db.get_shared_connection()
     project_positions = {}
 
+    # One JOIN for every snapshot of the query instead of one per snapshot
+    rows = conn.execute("""
+        SELECT sr.snapshot_id, sr.position, p.behance_id, p.title
+        FROM search_results sr
+        JOIN snapshots s ON sr.snapshot_id = s.id
+        JOIN projects p ON sr.project_id = p.id
+        WHERE s.query = ?
+        ORDER BY sr.snapshot_id, sr.position
+    """, (query,)).fetchall()
+    results_by_snapshot = {
+        sid: list(group) for sid, group in groupby(rows, key=lambda r: r["snapshot_id"])
+    }
+
     for snap in snapshots:
-        results = conn.execute("""
-            SELECT sr.position, p.behance_id, p.title
-            FROM search_results sr
-            JOIN projects p ON sr.project_id = p.id
-            WHERE sr.snapshot_id = ?
-            ORDER BY sr.position
-        """, (snap["id"],)).fetchall()
-
-        for r in results:
+        for r in results_by_snapshot.get(snap["id"], []):
             pid = r["behance_id"]
             if pid not in project_positions:
                 project_positions[pid] = {"title": r["title"], "positions": []}
@@ -442,8 +481,6 @@ def trend_analysis(query: str) -> str:
                 "position": r["position"],
             })
 
-    conn.close()
-
     # Stable projects (in multiple snapshots)
     stable = {pid: d for pid, d in project_positions.items() if len(d["positions"]) >= 2}
     one_timers = {pid: d for pid, d in project_positions.items() if len(d["positions"]) == 1}
@@ -500,6 +537,9 @@ def experiment_tracking_report() -> str:
         first = history[0]
         latest = history[-1]
         total_snapshots = len(history)
+        hist = pd.DataFrame(history).astype(
+            {"position_infografika": "Int64", "position_design_cards": "Int64"}
+        )
 
         lines.append(f"  Snapshots: {total_snapshots}")
         lines.append(f"  First seen: {first['timestamp'][:16]}")
@@ -511,10 +551,8 @@ def experiment_tracking_report() -> str:
         if total_snapshots >= 2:
             appr_diff = latest["appreciations"] - first["appreciations"]
             views_diff = latest["views"] - first["views"]
-            time_diff_hours = (
-                datetime.fromisoformat(latest["timestamp"]) -
-                datetime.fromisoformat(first["timestamp"])
-            ).total_seconds() / 3600
+            ts = pd.to_datetime(hist["timestamp"], format="ISO8601")
+            time_diff_hours = (ts.iloc[-1] - ts.iloc[0]).total_seconds() / 3600
             if time_diff_hours > 0:
                 lines.append(f"  Velocity over {time_diff_hours:.0f}h:")
                 lines.append(f"    Appr:  {first['appreciations']} -> {latest['appreciations']} (+{appr_diff}, {appr_diff / (time_diff_hours/24):.1f}/day)")
@@ -539,14 +577,16 @@ def experiment_tracking_report() -> str:
             lines.append(f"    {ts} | {status} | appr={h['appreciations']} views={h['views']}")
 
         # Summary
-        best_pos_inf = min((h["position_infografika"] for h in history if h["position_infografika"]), default=None)
-        best_pos_dc = min((h["position_design_cards"] for h in history if h["position_design_cards"]), default=None)
-        times_in_top = sum(1 for h in history if h["position_infografika"] or h["position_design_cards"])
+        best_pos_inf = hist["position_infografika"].min()
+        best_pos_dc = hist["position_design_cards"].min()
+        times_in_top = int(
+            (hist["position_infografika"].notna() | hist["position_design_cards"].notna()).sum()
+        )
 
         lines.append(f"")
         lines.append(f"  SUMMARY:")
-        lines.append(f"    Best position (инфографика):    {'#' + str(best_pos_inf) if best_pos_inf else 'never in top-100'}")
-        lines.append(f"    Best position (дизайн карточек): {'#' + str(best_pos_dc) if best_pos_dc else 'never in top-100'}")
+        lines.append(f"    Best position (инфографика):    {'#' + str(best_pos_inf) if pd.notna(best_pos_inf) else 'never in top-100'}")
+        lines.append(f"    Best position (дизайн карточек): {'#' + str(best_pos_dc) if pd.notna(best_pos_dc) else 'never in top-100'}")
         lines.append(f"    Times found in top-100: {times_in_top}/{total_snapshots} snapshots")
         lines.append(f"")
 
@@ -747,44 +787,66 @@ def experiment_comparison() -> str:
 # Full report
 # ---------------------------------------------------------------------------
 
+def _query_report(query: str, my_df: pd.DataFrame) -> list[str]:
+    """All per-query report sections, in report order."""
+    df = load_latest_snapshot(query)
+    if df is None or df.empty:
+        return [f"\nNo data for query: '{query}'"]
+
+    return [
+        descriptive_stats(df, query),
+        correlation_analysis(df, query),
+        gap_analysis(df, my_df, query),
+        trend_analysis(query),
+    ]
+
+
 def generate_full_report(queries: list[str] | None = None) -> str:
+    """
+    Build the full report, streaming each section to the report file and
+    stdout as soon as it is ready.
+
+    Returns the path of the saved report file, not the report text (the
+    text is never held in memory as a whole; read the file if needed).
+    """
     if queries is None:
         queries = config.SEARCH_QUERIES["primary"]
 
-    report_parts = []
-    report_parts.append(f"\n{'#'*80}")
-    report_parts.append(f"  BEHANCE SEARCH ANALYSIS REPORT")
-    report_parts.append(f"  Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
-    report_parts.append(f"{'#'*80}")
+    # Reports only read; migrate (writer + backfill) just for an old DB
+    if not db.schema_current():
+        db.init_db()
 
-    my_df = load_my_projects_df()
+    os.makedirs(config.REPORTS_DIR, exist_ok=True)
+    filename = f"report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.txt"
+    filepath = os.path.join(config.REPORTS_DIR, filename)
 
-    for query in queries:
-        df = load_latest_snapshot(query)
-        if df is None or df.empty:
-            report_parts.append(f"\nNo data for query: '{query}'")
-            continue
+    with open(filepath, "w", encoding="utf-8") as f:
+        def emit(section: str):
+            f.write(section)
+            sys.stdout.write(section)
 
-        report_parts.append(descriptive_stats(df, query))
-        report_parts.append(correlation_analysis(df, query))
-        report_parts.append(gap_analysis(df, my_df, query))
-        report_parts.append(trend_analysis(query))
+        emit("\n".join([
+            f"\n{'#'*80}",
+            f"  BEHANCE SEARCH ANALYSIS REPORT",
+            f"  Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}",
+            f"{'#'*80}",
+        ]))
 
-    report_parts.append(experiment_tracking_report())
-    report_parts.append(experiment_comparison())
+        my_df = load_my_projects_df()
 
-    report = "\n".join(report_parts)
+        # Queries are independent: build their sections concurrently, keep order
+        with ThreadPoolExecutor(max_workers=max(1, min(len(queries), 4))) as pool:
+            for sections in pool.map(lambda q: _query_report(q, my_df), queries):
+                for section in sections:
+                    emit("\n" + section)
 
-    os.makedirs(config.REPORTS_DIR, exist_ok=True)
-    filename = f"report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.txt"
-    filepath = os.path.join(config.REPORTS_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(report)
+        emit("\n" + experiment_tracking_report())
+        emit("\n" + experiment_comparison())
 
-    print(report)
+    print()
     print(f"\nReport saved to: {filepath}")
 
-    return report
+    return filepath
 
 
 if __name__ == "__main__":
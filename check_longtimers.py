@@ -1,13 +1,12 @@
 """Find projects that hold positions for long periods."""
-import sqlite3
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 for query in ["инфографика", "дизайн карточек"]:
     print(f"\n{'='*80}")
@@ -1,9 +1,9 @@
-import sqlite3, os, sys
+import os, sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 rows = conn.execute("""
     SELECT username, display_name, has_pro, has_services, has_banner, has_website_link
     FROM authors
@@ -1,14 +1,13 @@
 """Deep analysis: do titles/tags matter for TOP positions?"""
-import sqlite3
 import os
 import sys
 import re
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 for query in ["инфографика", "дизайн карточек"]:
     last_snap = conn.execute(
@@ -20,10 +19,13 @@ for query in ["инфографика", "дизайн карточек"]:
     print(f"{'='*70}")
 
     results = conn.execute("""
-        SELECT sr.position, sr.appreciations, sr.views, p.title, p.behance_id
+        SELECT sr.position, sr.appreciations, sr.views, p.title, p.behance_id,
+               GROUP_CONCAT(pt.tag_name, ', ') tags
         FROM search_results sr
         JOIN projects p ON sr.project_id=p.id
+        LEFT JOIN project_tags pt ON pt.project_id=p.id
         WHERE sr.snapshot_id=?
+        GROUP BY sr.id
         ORDER BY sr.position
     """, (last_snap,)).fetchall()
 
@@ -56,11 +58,7 @@ for query in ["инфографика", "дизайн карточек"]:
     # Tags analysis for top-20
     print(f"\n--- Top-20 tags containing query words ---")
     for r in results[:20]:
-        tags = conn.execute(
-            "SELECT GROUP_CONCAT(tag_name, ', ') t FROM project_tags WHERE project_id=(SELECT id FROM projects WHERE behance_id=?)",
-            (r["behance_id"],)
-        ).fetchone()
-        tag_str = tags["t"] or ""
+        tag_str = r["tags"] or ""
         has_query_tag = "YES" if any(w in tag_str.lower() for w in query_words) else "no"
         print(f"  #{r['position']:>3} [{has_query_tag:>3}] tags: {tag_str[:80] or 'NONE'}")
 
@@ -1,14 +1,13 @@
 """Check tools, creative fields, description correlation with position."""
-import sqlite3
 import os
 import sys
 import json
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 for query in ["инфографика", "дизайн карточек"]:
     last_snap = conn.execute(
@@ -15,6 +15,8 @@ else:
 DATA_DIR = os.path.join(BASE_DIR, "data")
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 DB_PATH = os.path.join(DATA_DIR, "behance.db")
+# Browser profile shared by the debug/rescan scripts (keeps cookies, cache)
+PW_PROFILE_DIR = os.path.join(BASE_DIR, ".pw-profile")
 
 MY_PROFILE_URL = "https://www.behance.net/valeriy_maslov"
 MY_USERNAME = "valeriy_maslov"
@@ -53,8 +55,24 @@ SORT_TYPE = "recommended"
 PROJECTS_PER_QUERY = 100  # ~4 pages
 PAGES_PER_QUERY = 5       # with buffer
 
+# Minimum random gap (seconds) between page loads from one host, shared by
+# all pages that load in parallel (scraper._throttle)
 SCRAPE_DELAY_MIN = 2.0
 SCRAPE_DELAY_MAX = 5.0
+# Project/profile pages scraped in parallel (one browser context each);
+# keep low to avoid rate limits
+SCRAPE_CONCURRENCY = 4
+
+# Re-runs within this many seconds reuse parsed project pages from the DB
+# instead of reloading them (0 disables). Shorter than the daily schedule,
+# so scheduled runs always see fresh pages.
+PAGE_CACHE_TTL = 6 * 3600
+
+# Authors whose profile was scraped within this many seconds are not
+# reloaded (0 disables); their latest stored stats are reused for the new
+# snapshot. Profiles change slowly, but follower counts drift, so keep it
+# to a few days.
+AUTHOR_CACHE_TTL = 3 * 24 * 3600
 
 BEHANCE_BASE_URL = "https://www.behance.net"
 SEARCH_URL_TEMPLATE = (
@@ -65,6 +83,15 @@ SEARCH_URL_TEMPLATE = (
 REQUEST_TIMEOUT = 30_000  # ms
 NAVIGATION_TIMEOUT = 60_000  # ms
 
+# goto() options for the scraper and debug scripts: Behance's analytics
+# beacons keep "networkidle" from firing for many seconds, so load the DOM
+# and then wait for a selector that marks the content as rendered
+FAST_WAIT = {"wait_until": "domcontentloaded", "timeout": NAVIGATION_TIMEOUT}
+PROFILE_READY_SELECTOR = "h1"
+PROFILE_PROJECTS_SELECTOR = 'a[href*="/gallery/"]'
+PROJECT_READY_SELECTOR = 'h1, [class*="Permalink"]'
+READY_TIMEOUT = 15_000  # ms
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -3,21 +3,218 @@ Behance Analyzer — Database layer (SQLite)
 """
 import sqlite3
 import os
-from datetime import datetime
+import json
+import atexit
+import pathlib
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from config import DB_PATH, DATA_DIR
 
+_UTC = timezone.utc
+
+
+def _configure(conn: sqlite3.Connection, readonly: bool = False):
+    # Readers build dicts from cursor.description (_fetch_dicts) instead
+    conn.row_factory = None if readonly else sqlite3.Row
+    # WAL: readers never block on the writer; NORMAL is crash-safe in WAL
+    # mode and only fsyncs at checkpoints. In-memory DBs can't use WAL.
+    if not readonly and DB_PATH != ":memory:":
+        # Only takes effect on a new, empty file (or at the next VACUUM),
+        # and must come before journal_mode initializes the file
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Wait for a concurrent writer (CLI + ad-hoc script) instead of
+    # failing with SQLITE_BUSY straight away
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    conn.execute("PRAGMA foreign_keys=ON")
+
 
-def get_connection() -> sqlite3.Connection:
+def get_connection(check_same_thread: bool = True) -> sqlite3.Connection:
+    """New, independently owned connection. The caller closes it."""
     os.makedirs(DATA_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread)
+    _configure(conn)
+    return conn
+
+
+def _readonly_uri() -> str:
+    return f"{pathlib.Path(DB_PATH).resolve().as_uri()}?mode=ro"
+
+
+def get_readonly_connection(immutable: bool = False) -> sqlite3.Connection:
+    """
+    Read-only connection for the ad-hoc check/report scripts. It never
+    takes the write lock or runs a checkpoint, so it is safe to use while
+    a scrape is writing. The caller closes it.
+
+    immutable=True also skips locking and the WAL entirely, reading the
+    main file as-is. It only applies when no -wal file exists (i.e. no
+    writer is open and everything is checkpointed); otherwise the plain
+    mode=ro connection is returned so committed pages are not missed.
+    """
+    uri = _readonly_uri()
+    if immutable and not os.path.exists(f"{DB_PATH}-wal"):
+        uri += "&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    _configure(conn, readonly=True)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA cache_size=-64000")  # ~64 MB
     return conn
 
 
+# Connection pool used by the helpers below: WAL allows one writer and any
+# number of readers at once, so writes are serialized on a single
+# connection while getters borrow read-only ones. Closed at exit.
+_writer_conn: sqlite3.Connection | None = None
+# Re-entrant: on :memory: reads also hold it (see _read), and a caller may
+# write while still iterating an iter_* generator
+_writer_lock = threading.RLock()
+_readers: queue.SimpleQueue = queue.SimpleQueue()
+_all_readers: list[sqlite3.Connection] = []
+
+
+def _writer() -> sqlite3.Connection:
+    # Caller holds _writer_lock
+    global _writer_conn
+    if _writer_conn is None:
+        _writer_conn = get_connection(check_same_thread=False)
+    return _writer_conn
+
+
+@contextmanager
+def _write():
+    """Writer connection inside one BEGIN IMMEDIATE ... COMMIT transaction."""
+    with _writer_lock:
+        conn = _writer()
+        if conn.in_transaction:
+            # Nested in transaction(): the outermost block commits
+            yield conn
+            return
+        # Take the write lock up front rather than upgrading mid-transaction
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+@contextmanager
+def transaction():
+    """
+    Run several write helpers as one transaction, so a batch of saves
+    commits (and syncs) once instead of once per helper call.
+    """
+    with _write():
+        yield
+
+
+@contextmanager
+def _read():
+    """Borrow a read-only connection from the pool, opening one if none is idle."""
+    if DB_PATH == ":memory:":
+        # A second connection would see a different, empty database
+        with _writer_lock:
+            yield _writer()
+        return
+    try:
+        conn = _readers.get_nowait()
+    except queue.Empty:
+        conn = sqlite3.connect(_readonly_uri(), uri=True, check_same_thread=False)
+        _configure(conn, readonly=True)
+        _all_readers.append(conn)
+    try:
+        yield conn
+    finally:
+        _readers.put(conn)
+
+
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params=()) -> list[dict]:
+    """Run a query and return rows as dicts keyed by the cursor's column names."""
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples
+    rows = cur.execute(sql, params).fetchall()
+    cols = [col[0] for col in cur.description]
+    return [dict(zip(cols, row)) for row in rows]
+
+
+def _iter_dicts(sql: str, params=()):
+    """
+    Generator version of _fetch_dicts: yields each row as the cursor
+    produces it. The reader goes back to the pool once the generator is
+    exhausted or closed.
+    """
+    with _read() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None  # plain tuples
+        cur.execute(sql, params)
+        cols = [col[0] for col in cur.description]
+        for row in cur:
+            yield dict(zip(cols, row))
+
+
+def _close():
+    global _writer_conn
+    conns = list(_all_readers)
+    _all_readers.clear()
+    if _writer_conn is not None:
+        try:
+            # Refresh planner stats the session made stale and return a
+            # bounded number of free pages to the filesystem
+            _writer_conn.execute("PRAGMA optimize")
+            _writer_conn.execute("PRAGMA incremental_vacuum(100)").fetchall()
+        except sqlite3.Error:
+            pass
+        conns.append(_writer_conn)
+        _writer_conn = None
+    if _shared_conn is not None:
+        conns.append(_shared_conn)
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+atexit.register(_close)
+
+
+_shared_conn: sqlite3.Connection | None = None
+_shared_conn_lock = threading.Lock()
+
+
+def get_shared_connection() -> sqlite3.Connection:
+    """
+    Process-wide connection for read-heavy callers (analysis/reports).
+    Opened once with a larger page cache; safe to use from worker
+    threads. Callers must not close it.
+    """
+    global _shared_conn
+    with _shared_conn_lock:
+        if _shared_conn is None:
+            conn = get_connection(check_same_thread=False)
+            conn.execute("PRAGMA cache_size=-200000")  # ~200 MB
+            _shared_conn = conn
+    return _shared_conn
+
+
 def init_db():
-    conn = get_connection()
+    # executescript() manages its own transaction, so take the writer
+    # directly rather than through _write()
+    with _writer_lock:
+        _init_schema(_writer())
+
+
+def _init_schema(conn: sqlite3.Connection):
     c = conn.cursor()
 
     c.executescript("""
@@ -44,7 +241,10 @@ def init_db():
         has_website_link INTEGER DEFAULT 0,
         profile_completeness INTEGER DEFAULT 0,  -- 0-100 score
         first_seen      TEXT,
-        last_seen       TEXT
+        last_seen       TEXT,
+        -- Last full scrape whose stats went into author_snapshots
+        -- (see config.AUTHOR_CACHE_TTL); NULL = never
+        fetched_at      TEXT
     );
 
     CREATE TABLE IF NOT EXISTS author_snapshots (
@@ -114,20 +314,30 @@ def init_db():
         is_promoted     INTEGER DEFAULT 0,
         is_featured     INTEGER DEFAULT 0,
         cover_image_url TEXT,
+        engagement_rate       REAL,  -- appreciations / views
+        appreciations_per_day REAL,  -- at snapshot time
+        views_per_day         REAL,  -- at snapshot time
         FOREIGN KEY (snapshot_id) REFERENCES snapshots(id),
         FOREIGN KEY (project_id) REFERENCES projects(id)
     );
 
-    CREATE INDEX IF NOT EXISTS idx_search_results_snapshot
-        ON search_results(snapshot_id);
-    CREATE INDEX IF NOT EXISTS idx_search_results_project
-        ON search_results(project_id);
+    -- Indexes that are a prefix of another one (or of the UNIQUE
+    -- constraint's autoindex) only cost writes; the longer index serves
+    -- the same lookups
+    DROP INDEX IF EXISTS idx_search_results_snapshot;
+    DROP INDEX IF EXISTS idx_projects_behance_id;
+    DROP INDEX IF EXISTS idx_author_snapshots_author;
+    -- Covers per-project lookups and the distinct-project / snapshots-per-
+    -- project counts without touching the table
+    DROP INDEX IF EXISTS idx_search_results_project;
+    CREATE INDEX IF NOT EXISTS idx_search_results_project_snapshot
+        ON search_results(project_id, snapshot_id);
     CREATE INDEX IF NOT EXISTS idx_projects_author
         ON projects(author_id);
-    CREATE INDEX IF NOT EXISTS idx_projects_behance_id
-        ON projects(behance_id);
-    CREATE INDEX IF NOT EXISTS idx_author_snapshots_author
-        ON author_snapshots(author_id);
+    CREATE INDEX IF NOT EXISTS idx_search_results_snapshot_position
+        ON search_results(snapshot_id, position);
+    CREATE INDEX IF NOT EXISTS idx_author_snapshots_author_snapshot
+        ON author_snapshots(author_id, snapshot_id DESC);
     CREATE INDEX IF NOT EXISTS idx_snapshots_query
         ON snapshots(query);
 
@@ -144,268 +354,455 @@ def init_db():
         days_since_publish      REAL
     );
 
-    CREATE INDEX IF NOT EXISTS idx_tracked_behance_id
-        ON tracked_snapshots(behance_id);
+    -- (behance_id, timestamp) also serves plain behance_id lookups
+    DROP INDEX IF EXISTS idx_tracked_behance_id;
+    CREATE INDEX IF NOT EXISTS idx_tracked_behance_ts
+        ON tracked_snapshots(behance_id, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_projects_is_my
+        ON projects(id) WHERE is_my_project = 1;
+
+    -- Parsed project-page details (JSON), so a re-run inside
+    -- config.PAGE_CACHE_TTL skips reloading pages it already scraped.
+    -- query is part of the key: description_has_keyword depends on it.
+    CREATE TABLE IF NOT EXISTS page_cache (
+        url         TEXT NOT NULL,
+        query       TEXT NOT NULL DEFAULT '',
+        fetched_at  TEXT NOT NULL,
+        data        TEXT NOT NULL,
+        PRIMARY KEY (url, query)
+    );
     """)
 
+    # Migrate DBs created before authors.fetched_at existed
+    author_columns = _columns(c, "authors")
+    if "fetched_at" not in author_columns:
+        c.execute("ALTER TABLE authors ADD COLUMN fetched_at TEXT")
+
+    # Migrate DBs created before derived metrics were stored at ingest;
+    # only a migration leaves old rows to backfill
+    sr_columns = _columns(c, "search_results")
+    missing = [col for col in _DERIVED_COLUMNS if col not in sr_columns]
+    for col in missing:
+        c.execute(f"ALTER TABLE search_results ADD COLUMN {col} REAL")
+    if missing:
+        c.execute(_BACKFILL_DERIVED_SQL)
+
+    # Full ANALYZE only for a new or just-migrated DB; after that the
+    # PRAGMA optimize in _close() keeps planner stats fresh
+    has_stats = c.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone()
+    if missing or not has_stats:
+        c.execute("ANALYZE")
+
     conn.commit()
-    conn.close()
 
 
-def create_snapshot(query: str, sort_type: str = "recommended") -> int:
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO snapshots (timestamp, query, sort_type) VALUES (?, ?, ?)",
-        (datetime.utcnow().isoformat(), query, sort_type),
-    )
-    snapshot_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    return snapshot_id
+_DERIVED_COLUMNS = ("engagement_rate", "appreciations_per_day", "views_per_day")
 
 
-def update_snapshot_count(snapshot_id: int, count: int):
-    conn = get_connection()
-    conn.execute(
-        "UPDATE snapshots SET total_collected = ? WHERE id = ?",
-        (count, snapshot_id),
-    )
-    conn.commit()
-    conn.close()
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    # By index: reader connections return plain tuples
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
 
 
-def upsert_author(data: dict) -> int:
-    conn = get_connection()
-    c = conn.cursor()
-    now = datetime.utcnow().isoformat()
-
-    c.execute("SELECT id FROM authors WHERE username = ?", (data["username"],))
-    row = c.fetchone()
-
-    if row:
-        author_id = row["id"]
-        c.execute("""
-            UPDATE authors SET
-                display_name = COALESCE(?, display_name),
-                url = COALESCE(?, url),
-                location = COALESCE(?, location),
-                member_since = COALESCE(?, member_since),
-                bio_text = COALESCE(?, bio_text),
-                has_pro = COALESCE(?, has_pro),
-                has_services = COALESCE(?, has_services),
-                hire_status = COALESCE(?, hire_status),
-                has_banner = COALESCE(?, has_banner),
-                has_website_link = COALESCE(?, has_website_link),
-                profile_completeness = COALESCE(?, profile_completeness),
-                last_seen = ?
-            WHERE id = ?
-        """, (
-            data.get("display_name"), data.get("url"),
-            data.get("location"), data.get("member_since"),
-            data.get("bio_text"), data.get("has_pro"),
-            data.get("has_services"), data.get("hire_status"),
-            data.get("has_banner"), data.get("has_website_link"),
-            data.get("profile_completeness"), now, author_id,
-        ))
-    else:
-        c.execute("""
-            INSERT INTO authors (
-                username, display_name, url, location, member_since,
-                bio_text, has_pro, has_services, hire_status,
-                has_banner, has_website_link, profile_completeness,
-                first_seen, last_seen
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data["username"], data.get("display_name"), data.get("url"),
-            data.get("location"), data.get("member_since"),
-            data.get("bio_text"), data.get("has_pro", 0),
-            data.get("has_services", 0), data.get("hire_status"),
-            data.get("has_banner", 0), data.get("has_website_link", 0),
-            data.get("profile_completeness", 0), now, now,
-        ))
-        author_id = c.lastrowid
+def schema_current() -> bool:
+    """True if the DB already has every column init_db() migrates in (checked on a reader)."""
+    try:
+        with _read() as conn:
+            return (
+                "fetched_at" in _columns(conn, "authors")
+                and set(_DERIVED_COLUMNS) <= _columns(conn, "search_results")
+            )
+    except sqlite3.OperationalError:
+        return False  # no DB file yet
 
-    conn.commit()
-    conn.close()
-    return author_id
 
+# Whole days between publish date and the snapshot a search result belongs to
+_PUBLISH_AGE_SQL = """(
+    SELECT CAST(julianday(s.timestamp) - julianday(p.published_date) AS INTEGER)
+    FROM snapshots s, projects p
+    WHERE s.id = search_results.snapshot_id AND p.id = search_results.project_id
+)"""
 
-def upsert_author_snapshot(author_id: int, snapshot_id: int, stats: dict):
-    conn = get_connection()
-    conn.execute("""
-        INSERT INTO author_snapshots (
-            author_id, snapshot_id, total_views, total_appreciations,
-            followers, following, project_count
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        author_id, snapshot_id,
-        stats.get("total_views", 0), stats.get("total_appreciations", 0),
-        stats.get("followers", 0), stats.get("following", 0),
-        stats.get("project_count", 0),
-    ))
-    conn.commit()
-    conn.close()
+_BACKFILL_DERIVED_SQL = f"""
+    UPDATE search_results SET
+        engagement_rate = CASE WHEN views > 0
+            THEN CAST(appreciations AS REAL) / views ELSE 0 END,
+        appreciations_per_day = CASE WHEN {_PUBLISH_AGE_SQL} > 0
+            THEN CAST(appreciations AS REAL) / {_PUBLISH_AGE_SQL} ELSE 0 END,
+        views_per_day = CASE WHEN {_PUBLISH_AGE_SQL} > 0
+            THEN CAST(views AS REAL) / {_PUBLISH_AGE_SQL} ELSE 0 END
+    WHERE engagement_rate IS NULL
+"""
 
 
-def upsert_project(data: dict) -> int:
-    conn = get_connection()
-    c = conn.cursor()
-    now = datetime.utcnow().isoformat()
+def utc_now() -> str:
+    """
+    Current time as naive UTC ISO text (the format every timestamp column
+    uses). Batch callers compute it once and pass it to helpers as `now`.
+    """
+    return datetime.now(_UTC).replace(tzinfo=None).isoformat()
 
-    c.execute(
-        "SELECT id FROM projects WHERE behance_id = ?",
-        (data["behance_id"],),
-    )
-    row = c.fetchone()
-
-    fields = [
-        "title", "url", "url_slug", "published_date",
-        "publish_day_of_week", "publish_hour", "author_id",
-        "module_count", "image_count", "video_count", "text_count",
-        "embed_count", "description_length", "description_has_query_keywords",
-        "title_keyword_match", "has_external_links", "external_link_count",
-        "cover_image_url", "cover_image_width", "cover_image_height",
-        "comments_count", "saves_count", "is_featured", "co_owners_count",
-        "creative_fields", "tools_used", "is_my_project",
-    ]
-
-    if row:
-        project_id = row["id"]
-        set_clauses = ", ".join(
-            f"{f} = COALESCE(?, {f})" for f in fields
-        )
-        values = [data.get(f) for f in fields]
-        values.extend([now, project_id])
-        c.execute(
-            f"UPDATE projects SET {set_clauses}, last_seen = ? WHERE id = ?",
-            values,
+
+def create_snapshot(query: str, sort_type: str = "recommended", now: str | None = None) -> int:
+    with _write() as conn:
+        c = conn.execute(
+            "INSERT INTO snapshots (timestamp, query, sort_type) VALUES (?, ?, ?)",
+            (now or utc_now(), query, sort_type),
         )
-    else:
-        all_fields = fields + ["behance_id", "first_seen", "last_seen"]
-        placeholders = ", ".join("?" for _ in all_fields)
-        col_names = ", ".join(all_fields)
-        values = [data.get(f) for f in fields]
-        values.extend([data["behance_id"], now, now])
-        c.execute(
-            f"INSERT INTO projects ({col_names}) VALUES ({placeholders})",
-            values,
+        return c.lastrowid
+
+
+def update_snapshot_count(snapshot_id: int, count: int):
+    with _write() as conn:
+        conn.execute(
+            "UPDATE snapshots SET total_collected = ? WHERE id = ?",
+            (count, snapshot_id),
         )
-        project_id = c.lastrowid
 
-    conn.commit()
-    conn.close()
-    return project_id
+
+_AUTHOR_FIELDS = (
+    "display_name", "url", "location", "member_since", "bio_text",
+    "has_pro", "has_services", "hire_status", "has_banner",
+    "has_website_link", "profile_completeness",
+)
+_AUTHOR_DEFAULTS = {
+    "has_pro": 0, "has_services": 0, "has_banner": 0,
+    "has_website_link": 0, "profile_completeness": 0,
+}
+# Named parameters: the inserted row falls back to _AUTHOR_DEFAULTS, while
+# an update keeps the stored value for any field that wasn't scraped
+_UPSERT_AUTHOR_SQL = (
+    "INSERT INTO authors (username, "
+    + ", ".join(_AUTHOR_FIELDS)
+    + ", first_seen, last_seen, fetched_at) VALUES (:username, "
+    + ", ".join(
+        f"COALESCE(:{f}, {_AUTHOR_DEFAULTS[f]})" if f in _AUTHOR_DEFAULTS else f":{f}"
+        for f in _AUTHOR_FIELDS
+    )
+    + ", :now, :now, :fetched_at) ON CONFLICT(username) DO UPDATE SET "
+    + ", ".join(f"{f} = COALESCE(:{f}, {f})" for f in _AUTHOR_FIELDS)
+    + ", last_seen = :now, fetched_at = COALESCE(:fetched_at, fetched_at)"
+)
+
+
+def _author_params(data: dict, now: str) -> dict:
+    params = {f: data.get(f) for f in _AUTHOR_FIELDS}
+    params["username"] = data["username"]
+    params["now"] = now
+    params["fetched_at"] = data.get("fetched_at")
+    return params
+
+
+def _ids_by_key(conn: sqlite3.Connection, table: str, key: str, values: list) -> dict:
+    """{key value: id} for the given rows, resolved with one IN query."""
+    placeholders = ", ".join("?" for _ in values)
+    rows = conn.execute(
+        f"SELECT {key}, id FROM {table} WHERE {key} IN ({placeholders})",
+        values,
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def upsert_author(data: dict, now: str | None = None) -> int:
+    params = _author_params(data, now or utc_now())
+    with _write() as conn:
+        return conn.execute(_UPSERT_AUTHOR_SQL + " RETURNING id", params).fetchone()[0]
+
+
+def upsert_authors_many(authors: list[dict], now: str | None = None) -> dict[str, int]:
+    """Upsert many authors in one transaction. Returns {username: author id}."""
+    if not authors:
+        return {}
+    now = now or utc_now()
+    with _write() as conn:
+        conn.executemany(_UPSERT_AUTHOR_SQL, [_author_params(a, now) for a in authors])
+        return _ids_by_key(conn, "authors", "username", [a["username"] for a in authors])
+
+
+def upsert_author_snapshot(author_id: int, snapshot_id: int, stats: dict):
+    upsert_author_snapshots_many([(author_id, snapshot_id, stats)])
+
+
+def upsert_author_snapshots_many(rows):
+    """Insert (author_id, snapshot_id, stats) rows in a single transaction."""
+    with _write() as conn:
+        conn.executemany("""
+            INSERT INTO author_snapshots (
+                author_id, snapshot_id, total_views, total_appreciations,
+                followers, following, project_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, ((
+            author_id, snapshot_id,
+            stats.get("total_views", 0), stats.get("total_appreciations", 0),
+            stats.get("followers", 0), stats.get("following", 0),
+            stats.get("project_count", 0),
+        ) for author_id, snapshot_id, stats in rows))
+
+
+_PROJECT_FIELDS = (
+    "title", "url", "url_slug", "published_date",
+    "publish_day_of_week", "publish_hour", "author_id",
+    "module_count", "image_count", "video_count", "text_count",
+    "embed_count", "description_length", "description_has_query_keywords",
+    "title_keyword_match", "has_external_links", "external_link_count",
+    "cover_image_url", "cover_image_width", "cover_image_height",
+    "comments_count", "saves_count", "is_featured", "co_owners_count",
+    "creative_fields", "tools_used", "is_my_project",
+)
+_UPSERT_PROJECT_SQL = (
+    "INSERT INTO projects ("
+    + ", ".join(_PROJECT_FIELDS + ("behance_id", "first_seen", "last_seen"))
+    + ") VALUES ("
+    + ", ".join("?" for _ in range(len(_PROJECT_FIELDS) + 3))
+    + ") ON CONFLICT(behance_id) DO UPDATE SET "
+    + ", ".join(f"{f} = COALESCE(excluded.{f}, {f})" for f in _PROJECT_FIELDS)
+    + ", last_seen = excluded.last_seen"
+)
+
+
+def _project_params(data: dict, now: str) -> tuple:
+    return tuple(data.get(f) for f in _PROJECT_FIELDS) + (data["behance_id"], now, now)
+
+
+def upsert_project(data: dict, now: str | None = None) -> int:
+    params = _project_params(data, now or utc_now())
+    with _write() as conn:
+        return conn.execute(_UPSERT_PROJECT_SQL + " RETURNING id", params).fetchone()[0]
+
+
+def upsert_projects_many(projects: list[dict], now: str | None = None) -> dict[str, int]:
+    """Upsert many projects in one transaction. Returns {behance_id: project id}."""
+    if not projects:
+        return {}
+    now = now or utc_now()
+    with _write() as conn:
+        conn.executemany(_UPSERT_PROJECT_SQL, [_project_params(p, now) for p in projects])
+        return _ids_by_key(conn, "projects", "behance_id", [p["behance_id"] for p in projects])
 
 
 def insert_project_tags(project_id: int, tags: list[str]):
-    conn = get_connection()
-    for tag in tags:
-        conn.execute(
+    insert_project_tags_many((project_id, tag) for tag in tags)
+
+
+def insert_project_tags_many(rows):
+    """Insert (project_id, tag_name) pairs in a single transaction."""
+    with _write() as conn:
+        conn.executemany(
             "INSERT OR IGNORE INTO project_tags (project_id, tag_name) VALUES (?, ?)",
-            (project_id, tag.strip()),
+            ((project_id, tag.strip()) for project_id, tag in rows),
         )
-    conn.commit()
-    conn.close()
 
 
 def insert_search_result(snapshot_id: int, data: dict):
-    conn = get_connection()
-    conn.execute("""
-        INSERT INTO search_results (
-            snapshot_id, project_id, position, appreciations, views,
-            comments, is_promoted, is_featured, cover_image_url
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        snapshot_id, data["project_id"], data["position"],
-        data.get("appreciations", 0), data.get("views", 0),
-        data.get("comments", 0), data.get("is_promoted", 0),
-        data.get("is_featured", 0), data.get("cover_image_url"),
-    ))
-    conn.commit()
-    conn.close()
+    insert_search_results_many(snapshot_id, [data])
+
+
+def insert_search_results_many(snapshot_id: int, rows):
+    """Insert a snapshot's search result dicts in a single transaction."""
+    with _write() as conn:
+        conn.executemany("""
+            INSERT INTO search_results (
+                snapshot_id, project_id, position, appreciations, views,
+                comments, is_promoted, is_featured, cover_image_url,
+                engagement_rate, appreciations_per_day, views_per_day
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, ((
+            snapshot_id, data["project_id"], data["position"],
+            data.get("appreciations", 0), data.get("views", 0),
+            data.get("comments", 0), data.get("is_promoted", 0),
+            data.get("is_featured", 0), data.get("cover_image_url"),
+            data.get("engagement_rate", 0), data.get("appreciations_per_day", 0),
+            data.get("views_per_day", 0),
+        ) for data in rows))
+
+
+def iter_snapshots_for_query(query: str) -> Iterator[dict]:
+    return _iter_dicts(
+        "SELECT * FROM snapshots WHERE query = ? ORDER BY timestamp DESC",
+        (query,),
+    )
 
 
 def get_all_snapshots_for_query(query: str) -> list:
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM snapshots WHERE query = ? ORDER BY timestamp DESC",
-        (query,),
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return list(iter_snapshots_for_query(query))
+
+
+_SEARCH_RESULTS_SQL = """
+    SELECT sr.*, p.title, p.behance_id, p.published_date,
+           p.module_count, p.image_count, p.video_count,
+           p.description_length, p.is_featured as p_featured,
+           p.co_owners_count, p.tools_used, p.creative_fields,
+           p.is_my_project, p.title_keyword_match, p.author_id,
+           a.username, a.display_name, a.has_pro, a.has_services
+    FROM search_results sr
+    JOIN projects p ON sr.project_id = p.id
+    LEFT JOIN authors a ON p.author_id = a.id
+    WHERE sr.snapshot_id = ?
+    ORDER BY sr.position ASC
+"""
+
+
+def iter_search_results_for_snapshot(snapshot_id: int) -> Iterator[dict]:
+    return _iter_dicts(_SEARCH_RESULTS_SQL, (snapshot_id,))
 
 
 def get_search_results_for_snapshot(snapshot_id: int) -> list:
-    conn = get_connection()
-    rows = conn.execute("""
-        SELECT sr.*, p.title, p.behance_id, p.published_date,
-               p.module_count, p.image_count, p.video_count,
-               p.description_length, p.is_featured as p_featured,
-               p.co_owners_count, p.tools_used, p.creative_fields,
-               p.is_my_project, p.title_keyword_match,
-               a.username, a.display_name, a.has_pro, a.has_services
-        FROM search_results sr
-        JOIN projects p ON sr.project_id = p.id
-        LEFT JOIN authors a ON p.author_id = a.id
-        WHERE sr.snapshot_id = ?
-        ORDER BY sr.position ASC
-    """, (snapshot_id,)).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return list(iter_search_results_for_snapshot(snapshot_id))
+
+
+def get_search_results_columns(snapshot_id: int) -> dict[str, list]:
+    """
+    Same rows as get_search_results_for_snapshot, but column-oriented
+    ({column: [values...]}), ready for pd.DataFrame without a dict per row.
+    Returns {} when the snapshot has no results.
+    """
+    with _read() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None  # plain tuples
+        rows = cur.execute(_SEARCH_RESULTS_SQL, (snapshot_id,)).fetchall()
+        names = [col[0] for col in cur.description]
+    if not rows:
+        return {}
+    return {name: list(values) for name, values in zip(names, zip(*rows))}
 
 
 def get_author_stats_latest(author_id: int) -> dict | None:
-    conn = get_connection()
-    row = conn.execute("""
-        SELECT * FROM author_snapshots
-        WHERE author_id = ?
-        ORDER BY snapshot_id DESC LIMIT 1
-    """, (author_id,)).fetchone()
-    conn.close()
-    return dict(row) if row else None
-
-
-def insert_tracked_snapshot(data: dict):
-    conn = get_connection()
-    conn.execute("""
-        INSERT INTO tracked_snapshots (
-            timestamp, behance_id, label, appreciations, views,
-            comments, position_infografika, position_design_cards,
-            days_since_publish
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        datetime.utcnow().isoformat(),
-        data["behance_id"], data.get("label"),
-        data.get("appreciations", 0), data.get("views", 0),
-        data.get("comments", 0),
-        data.get("position_infografika"),
-        data.get("position_design_cards"),
-        data.get("days_since_publish"),
-    ))
-    conn.commit()
-    conn.close()
+    with _read() as conn:
+        rows = _fetch_dicts(conn, """
+            SELECT * FROM author_snapshots
+            WHERE author_id = ?
+            ORDER BY snapshot_id DESC LIMIT 1
+        """, (author_id,))
+    return rows[0] if rows else None
+
+
+def get_author_stats_latest_many(author_ids: list[int]) -> list:
+    """Latest author_snapshots row for each author, in one query."""
+    if not author_ids:
+        return []
+    placeholders = ", ".join("?" for _ in author_ids)
+    with _read() as conn:
+        # SQLite fills bare columns from the row holding MAX(snapshot_id)
+        return _fetch_dicts(conn, f"""
+            SELECT author_id, total_views, total_appreciations, followers,
+                   following, project_count, MAX(snapshot_id) AS snapshot_id
+            FROM author_snapshots
+            WHERE author_id IN ({placeholders})
+            GROUP BY author_id
+        """, author_ids)
+
+
+def get_recent_authors(usernames: list[str], max_age: float) -> dict[str, dict]:
+    """
+    Authors fully scraped within `max_age` seconds, by username: the stored
+    profile fields plus their latest author_snapshots stats under "stats".
+    Authors without a stats row are left out.
+    """
+    if not usernames:
+        return {}
+    placeholders = ", ".join("?" for _ in usernames)
+    with _read() as conn:
+        authors = _fetch_dicts(conn, f"""
+            SELECT id, username, fetched_at, {", ".join(_AUTHOR_FIELDS)}
+            FROM authors
+            WHERE username IN ({placeholders}) AND fetched_at >= ?
+        """, [*usernames, _cache_cutoff(max_age)])
+    stats = {r.pop("author_id"): r for r in get_author_stats_latest_many([a["id"] for a in authors])}
+    recent = {}
+    for a in authors:
+        row = stats.get(a.pop("id"))
+        if row is not None:
+            row.pop("snapshot_id")
+            recent[a["username"]] = {**a, "stats": row}
+    return recent
+
+
+def insert_tracked_snapshot(data: dict, now: str | None = None):
+    insert_tracked_snapshots_many([data], now)
+
+
+def insert_tracked_snapshots_many(rows, now: str | None = None):
+    """Insert tracked-project dicts, all stamped `now`, in a single transaction."""
+    now = now or utc_now()
+    with _write() as conn:
+        conn.executemany("""
+            INSERT INTO tracked_snapshots (
+                timestamp, behance_id, label, appreciations, views,
+                comments, position_infografika, position_design_cards,
+                days_since_publish
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, ((
+            now,
+            data["behance_id"], data.get("label"),
+            data.get("appreciations", 0), data.get("views", 0),
+            data.get("comments", 0),
+            data.get("position_infografika"),
+            data.get("position_design_cards"),
+            data.get("days_since_publish"),
+        ) for data in rows))
+
+
+def _cache_cutoff(max_age: float) -> str:
+    return (datetime.now(_UTC).replace(tzinfo=None) - timedelta(seconds=max_age)).isoformat()
+
+
+def get_page_cache(max_age: float) -> dict[tuple[str, str], dict]:
+    """Cached page details fetched within `max_age` seconds, by (url, query)."""
+    with _read() as conn:
+        rows = conn.execute(
+            "SELECT url, query, data FROM page_cache WHERE fetched_at >= ?",
+            (_cache_cutoff(max_age),),
+        ).fetchall()
+    return {(url, query): json.loads(data) for url, query, data in rows}
+
+
+def put_page_cache_many(rows, max_age: float, now: str | None = None):
+    """Store (url, query, details) entries and drop ones older than `max_age`."""
+    now = now or utc_now()
+    with _write() as conn:
+        conn.execute("DELETE FROM page_cache WHERE fetched_at < ?", (_cache_cutoff(max_age),))
+        conn.executemany(
+            "INSERT OR REPLACE INTO page_cache (url, query, fetched_at, data) VALUES (?, ?, ?, ?)",
+            ((url, query, now, json.dumps(data, ensure_ascii=False))
+             for url, query, data in rows),
+        )
 
 
-def get_tracked_history(behance_id: str) -> list:
-    conn = get_connection()
-    rows = conn.execute(
+def iter_tracked_history(behance_id: str) -> Iterator[dict]:
+    return _iter_dicts(
         "SELECT * FROM tracked_snapshots WHERE behance_id = ? ORDER BY timestamp ASC",
         (behance_id,),
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    )
+
+
+def get_tracked_history(behance_id: str) -> list:
+    return list(iter_tracked_history(behance_id))
+
+
+def iter_my_projects() -> Iterator[dict]:
+    return _iter_dicts("SELECT * FROM projects WHERE is_my_project = 1")
 
 
 def get_my_projects() -> list:
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM projects WHERE is_my_project = 1",
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return list(iter_my_projects())
+
+
+def vacuum():
+    """Rebuild the database file, compacting it and enabling incremental auto-vacuum."""
+    with _writer_lock:
+        conn = _writer()
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
 
 
 if __name__ == "__main__":
-    init_db()
-    print(f"Database initialized at {DB_PATH}")
+    import sys
+
+    if sys.argv[1:] == ["vacuum"]:
+        vacuum()
+        print(f"Database vacuumed at {DB_PATH}")
+    else:
+        init_db()
+        print(f"Database initialized at {DB_PATH}")
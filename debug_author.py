@@ -7,25 +7,30 @@ import re
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
 
+STATS_KEYWORD_RE = re.compile(
+    r"view|просмотр|оценок|оценка|оценки|подписч|follow|member|участник"
+    r"|на behance|project|проект",
+    re.IGNORECASE,
+)
+
 
 async def debug():
     from playwright.async_api import async_playwright
 
     async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        ctx = await browser.new_context(
+        ctx = await pw.chromium.launch_persistent_context(
+            config.PW_PROFILE_DIR,
+            headless=True,
             user_agent=config.USER_AGENT,
             viewport={"width": 1920, "height": 1080},
             locale="ru-RU",
             timezone_id="Europe/Moscow",
         )
-        page = await ctx.new_page()
-        await page.goto(
-            "https://www.behance.net/Max_Ischenko",
-            wait_until="networkidle",
-            timeout=60000,
+        page = ctx.pages[0] if ctx.pages else await ctx.new_page()
+        await page.goto("https://www.behance.net/Max_Ischenko", **config.FAST_WAIT)
+        await page.wait_for_selector(
+            config.PROFILE_READY_SELECTOR, timeout=config.READY_TIMEOUT,
         )
-        await asyncio.sleep(3)
 
         text = await page.inner_text("body")
 
@@ -34,46 +39,44 @@ async def debug():
             ls = line.strip()
             if not ls:
                 continue
-            low = ls.lower()
-            keywords = [
-                "view", "просмотр", "оценок", "оценка", "оценки",
-                "подписч", "follow", "member", "участник",
-                "на behance", "project", "проект",
-            ]
-            if any(w in low for w in keywords):
+            if STATS_KEYWORD_RE.search(ls):
                 print(f"  LINE: {repr(ls[:120])}")
                 print(f"  HEX:  {' '.join(f'{ord(c):04x}' for c in ls[:40])}")
                 print()
 
         # Check for stats table/section
         print("=== TABLE ROWS ===")
-        rows = await page.query_selector_all("table tr")
-        for r in rows:
-            t = (await r.inner_text()).strip()
+        row_texts = await page.eval_on_selector_all(
+            "table tr", "els => els.map(el => el.innerText.trim())",
+        )
+        for t in row_texts:
             if t:
                 print(f"  TR: {repr(t[:100])}")
 
         # Check stats links
         print("\n=== ANALYTICS LINKS ===")
-        links = await page.query_selector_all('a[href*="/analytics"]')
+        links = await page.eval_on_selector_all(
+            'a[href*="/analytics"]',
+            """els => els.map(el => ({
+                text: el.innerText.trim(),
+                href: el.getAttribute("href"),
+                parent: el.closest('tr')?.innerText || el.parentElement?.innerText || '',
+            }))""",
+        )
         for lnk in links:
-            t = (await lnk.inner_text()).strip()
-            href = await lnk.get_attribute("href")
-            parent_text = await lnk.evaluate(
-                "el => el.closest('tr')?.innerText || el.parentElement?.innerText || ''"
-            )
-            print(f"  LINK: text={repr(t)} href={href}")
-            print(f"  PARENT: {repr(parent_text[:100])}")
+            print(f"  LINK: text={repr(lnk['text'])} href={lnk['href']}")
+            print(f"  PARENT: {repr(lnk['parent'][:100])}")
             print()
 
         # Check followers/following links
         print("=== FOLLOWER LINKS ===")
         for sel in ['a[href*="/followers"]', 'a[href*="/following"]']:
-            els = await page.query_selector_all(sel)
+            els = await page.eval_on_selector_all(
+                sel,
+                'els => els.map(el => ({text: el.innerText.trim(), href: el.getAttribute("href")}))',
+            )
             for el in els:
-                t = (await el.inner_text()).strip()
-                href = await el.get_attribute("href")
-                print(f"  {sel}: text={repr(t)} href={href}")
+                print(f"  {sel}: text={repr(el['text'])} href={el['href']}")
 
         # Check member since
         print("\n=== MEMBER SINCE ===")
@@ -93,7 +96,7 @@ async def debug():
         if loc:
             print(f"=== LOCATION === {repr(await loc.inner_text())}")
 
-        await browser.close()
+        await ctx.close()
 
 
 if __name__ == "__main__":
@@ -2,20 +2,20 @@
 ПОЛНЫЙ корреляционный анализ всех метрик vs позиция / стабильность / удержание.
 Spearman rank correlation + group comparisons.
 """
-import sqlite3
 import os
 import sys
 import json
 import re
 from datetime import datetime
 from collections import defaultdict
+from functools import lru_cache
 from math import isnan
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 
 def spearman(x, y):
@@ -58,6 +58,15 @@ def safe_json_list(val):
         return []
 
 
+@lru_cache(maxsize=4096)
+def get_author_latest_stats(author_id):
+    """Latest author_snapshots row; cached since authors repeat across projects."""
+    return conn.execute("""
+        SELECT total_views, total_appreciations, followers, following, project_count
+        FROM author_snapshots WHERE author_id=? ORDER BY snapshot_id DESC LIMIT 1
+    """, (author_id,)).fetchone()
+
+
 def load_all_project_data():
     """Load enriched project data with all metrics + position stats."""
     rows = conn.execute("""
@@ -88,10 +97,7 @@ def load_all_project_data():
         
         # Author stats
         if d.get("author_id"):
-            astats = conn.execute("""
-                SELECT total_views, total_appreciations, followers, following, project_count
-                FROM author_snapshots WHERE author_id=? ORDER BY snapshot_id DESC LIMIT 1
-            """, (d["author_id"],)).fetchone()
+            astats = get_author_latest_stats(d["author_id"])
             if astats:
                 d["author_total_views"] = astats["total_views"] or 0
                 d["author_total_appr"] = astats["total_appreciations"] or 0
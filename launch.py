@@ -2,23 +2,27 @@
 Launcher script that handles Cyrillic path issues on Windows.
 Place in a parent directory or use: python launch.py [command]
 """
+import functools
 import os
 import sys
 import importlib
 
 
+def _candidate_dirs():
+    """Possible project locations, most likely first; listed lazily."""
+    yield os.path.dirname(os.path.abspath(__file__))
+    base = "d:\\VibeCoding"
+    try:
+        yield from (os.path.join(base, d) for d in os.listdir(base) if not d.isascii())
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
 def find_project_dir():
     """Find the project directory (handles Cyrillic paths)."""
-    # Try direct path first
-    candidates = [
-        os.path.dirname(os.path.abspath(__file__)),
-        os.path.join("d:\\VibeCoding", [
-            d for d in os.listdir("d:\\VibeCoding") if not d.isascii()
-        ][0]) if os.path.exists("d:\\VibeCoding") else None,
-    ]
-
-    for path in candidates:
-        if path and os.path.exists(os.path.join(path, "run.py")):
+    for path in _candidate_dirs():
+        if os.path.exists(os.path.join(path, "run.py")):
             return path
 
     return os.getcwd()
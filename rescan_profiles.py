@@ -7,6 +7,12 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
 
+# Pages scraping in parallel. Requests to Behance are still spaced by
+# scraper._throttle (inside scrape_author_profile), so this only overlaps
+# page loads and doesn't raise the request rate
+CONCURRENCY = 4
+
+
 async def main():
     from playwright.async_api import async_playwright
     from scraper import scrape_author_profile
@@ -28,35 +34,51 @@ async def main():
     """).fetchall()
     conn.close()
 
-    print(f"Rescanning {len(authors)} author profiles...")
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(user_agent=config.USER_AGENT)
+    print(f"Rescanning {len(authors)} author profiles ({CONCURRENCY} pages)...")
+    queue = asyncio.Queue()
+    for i, auth in enumerate(authors):
+        queue.put_nowait((i, auth))
+    pending = []  # flushed to the DB in batches
 
-        for i, auth in enumerate(authors):
+    async def worker(ctx):
+        page = await ctx.new_page()
+        while True:
+            try:
+                i, auth = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
             username = auth["username"]
-            print(f"  [{i+1}/{len(authors)}] {username:<30}", end="", flush=True)
 
             try:
                 profile_data = await scrape_author_profile(page, username)
                 if profile_data:
                     profile_data["username"] = auth["username"]
-                    db.upsert_author(profile_data)
+                    pending.append(profile_data)
                     pro = profile_data.get("has_pro", 0)
                     svc = profile_data.get("has_services", 0)
                     ban = profile_data.get("has_banner", 0)
                     web = profile_data.get("has_website_link", 0)
                     hire = profile_data.get("hire_status", "")
-                    print(f" PRO={pro} Svc={svc} Banner={ban} Web={web} Hire={'yes' if hire else 'no'}")
+                    status = f"PRO={pro} Svc={svc} Banner={ban} Web={web} Hire={'yes' if hire else 'no'}"
                 else:
-                    print(" FAILED (no data)")
+                    status = "FAILED (no data)"
             except Exception as e:
-                print(f" ERROR: {e}")
+                status = f"ERROR: {e}"
+            print(f"  [{i+1}/{len(authors)}] {username:<30} {status}")
+
+            if len(pending) >= 200:
+                db.upsert_authors_many(pending)
+                pending.clear()
+        await page.close()
 
-            await asyncio.sleep(1.5)
+    async with async_playwright() as p:
+        ctx = await p.chromium.launch_persistent_context(
+            config.PW_PROFILE_DIR, headless=True, user_agent=config.USER_AGENT,
+        )
+        await asyncio.gather(*(worker(ctx) for _ in range(CONCURRENCY)))
+        await ctx.close()
 
-        await browser.close()
+    db.upsert_authors_many(pending)
 
     # Summary
     conn2 = sqlite3.connect(config.DB_PATH)
@@ -68,4 +90,5 @@ async def main():
     print(f"  Website: {row[3]}/{row[4]}")
     conn2.close()
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
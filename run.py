@@ -9,20 +9,31 @@ Usage:
     python run.py init                 — initialize database only
 """
 import sys
+import atexit
+import argparse
 import logging
-import time
-from datetime import datetime
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("behance_analyzer.log", encoding="utf-8"),
-    ],
-)
+import logging.handlers
+
 log = logging.getLogger(__name__)
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+def _setup_logging(to_file: bool):
+    handlers = [logging.StreamHandler()]
+    if to_file:
+        # The scraper logs per item; buffer file records and write them in
+        # batches (immediately on ERROR) instead of flushing every line.
+        fh = logging.FileHandler("behance_analyzer.log", encoding="utf-8", delay=True)
+        fh.setFormatter(logging.Formatter(LOG_FORMAT))
+        mh = logging.handlers.MemoryHandler(
+            capacity=512, flushLevel=logging.ERROR, target=fh,
+        )
+        atexit.register(fh.close)
+        atexit.register(mh.flush)
+        handlers.append(mh)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, handlers=handlers)
+
 
 def cmd_init():
     import db
@@ -31,11 +42,12 @@ def cmd_init():
 
 
 def cmd_collect(include_secondary=False):
+    import time
     import scraper
     log.info(f"Starting data collection (secondary={include_secondary})...")
-    start = time.time()
+    start = time.perf_counter()
     scraper.run_scrape(include_secondary=include_secondary)
-    elapsed = time.time() - start
+    elapsed = time.perf_counter() - start
     log.info(f"Collection completed in {elapsed:.0f}s ({elapsed/60:.1f}min)")
 
 
@@ -51,31 +63,46 @@ def cmd_full(include_secondary=False):
     cmd_analyze()
 
 
-def main():
-    args = sys.argv[1:]
+_COMMANDS = {
+    "init": cmd_init,
+    "collect": cmd_collect,
+    "analyze": cmd_analyze,
+    "full": cmd_full,
+}
+# Commands that accept --all
+_SECONDARY_COMMANDS = {"collect", "full"}
+
 
-    if not args:
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in _COMMANDS:
+        cmd = sub.add_parser(name)
+        if name in _SECONDARY_COMMANDS:
+            cmd.add_argument(
+                "--all", dest="include_secondary", action="store_true",
+                help="also scrape secondary queries",
+            )
+    return parser
+
+
+def main():
+    if not sys.argv[1:]:
         print(__doc__)
         sys.exit(0)
 
-    command = args[0].lower()
-    include_all = "--all" in args
+    kwargs = vars(_build_parser().parse_args())
+    command = kwargs.pop("command")
 
+    from datetime import datetime
+
+    _setup_logging(to_file=True)
     log.info(f"=== Behance Analyzer started at {datetime.utcnow().isoformat()} ===")
-    log.info(f"Command: {command}, include_secondary: {include_all}")
-
-    if command == "init":
-        cmd_init()
-    elif command == "collect":
-        cmd_collect(include_all)
-    elif command == "analyze":
-        cmd_analyze()
-    elif command == "full":
-        cmd_full(include_all)
-    else:
-        print(f"Unknown command: {command}")
-        print(__doc__)
-        sys.exit(1)
+    log.info(f"Command: {command}, include_secondary: {kwargs.get('include_secondary', False)}")
+
+    _COMMANDS[command](**kwargs)
 
 
 if __name__ == "__main__":
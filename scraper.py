@@ -3,11 +3,14 @@ Behance Analyzer — Scraper (Playwright-based)
 Collects search results, project details, and author profiles.
 """
 import asyncio
+import functools
 import json
 import logging
 import random
 import re
+import time
 import urllib.parse
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from playwright.async_api import async_playwright, Page, Browser, TimeoutError as PwTimeout
@@ -26,34 +29,96 @@ log = logging.getLogger(__name__)
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Patterns used per card / per page, compiled once at import
+_K_SUFFIX_RE = re.compile(r"([\d.]+)\s*[kKкК]")
+_M_SUFFIX_RE = re.compile(r"([\d.]+)\s*[mMмМ]")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_DIGITS_RE = re.compile(r"\d+")
+_GALLERY_ID_RE = re.compile(r"/gallery/(\d+)/")
+_USERNAME_RE = re.compile(r"behance\.net/([^/?#]+)")
+_SLUG_RE = re.compile(r"/gallery/\d+/([^?#]+)")
+# Card stats: the first number after a colon that follows the keyword
+_APPR_RU_RE = re.compile(r"(?:[Оо]ценок|[Оо]ценка|[Оо]ценки).*?:\s*([\d\s\xa0,.]+)", re.DOTALL)
+_VIEWS_RU_RE = re.compile(r"[Пп]росмотр.*?:\s*([\d\s\xa0,.]+)", re.DOTALL)
+_APPR_EN_RE = re.compile(r"([\d,.]+)\s*appreciations?\s+for", re.IGNORECASE)
+_VIEWS_EN_RE = re.compile(r"([\d,.]+)\s*views?\s+for", re.IGNORECASE)
+# "13 января 2026" (RU) or "January 13th, 2026" (EN); see _match_date
+_DATE_PATTERN = (
+    r"(?:(\d{1,2})\s+([^\W\d_]+)|([^\W\d_]+)\s+(\d{1,2})(?:st|nd|rd|th)?)"
+    r"[,\s]+(\d{4})"
+)
+_PUBLISHED_RE = re.compile(r"(?:Опубликовано|Published):\s*" + _DATE_PATTERN)
+_MEMBER_SINCE_RE = re.compile(r"(?:Member Since|Участник с|На Behance с):\s*" + _DATE_PATTERN)
+_ABOUT_RE = re.compile(r"(?:Обо мне|About)\n(.+?)(?:\n|Read More|Подробнее)", re.DOTALL)
+_COMMENT_COUNT_RE = re.compile(r'"commentCount"\s*:\s*(\d+)')
+_STATS_APPR_RE = re.compile(r'"stats"\s*:\s*\{\s*"appreciations"\s*:\s*\{\s*"all"\s*:\s*(\d+)')
+_CARD_NUMS_RE = re.compile(r"([\d,.]+[kKмМ]?)")
+# Profile stats table rows; groups: views, appreciations, followers, following
+_STAT_KEYWORD_RE = re.compile(r"(просмотры|views)|(оценки|appreciat)|(подписчики|follower)|(подписки|following)")
+
+
 def _rand_delay():
     return random.uniform(config.SCRAPE_DELAY_MIN, config.SCRAPE_DELAY_MAX)
 
 
+# Earliest time.monotonic() the next navigation to each host may start
+_host_next_at: dict[str, float] = {}
+
+
+async def _throttle(url: str):
+    """
+    The one politeness rule for every navigation, sequential or pooled
+    (including rescan_profiles.py): loads from the same host start at least
+    a random SCRAPE_DELAY_MIN..MAX seconds apart, however many pages are
+    open. Parallel pages only overlap their load time with that gap; they
+    never raise the request rate. The slot is reserved before the first
+    await, so concurrent callers can't claim the same one.
+    """
+    host = urllib.parse.urlsplit(url).hostname or ""
+    now = time.monotonic()
+    start = max(now, _host_next_at.get(host, 0.0))
+    _host_next_at[host] = start + _rand_delay()
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+async def _goto_ready(page: Page, url: str, selector: str):
+    """Load `url` up to DOMContentLoaded, then wait for `selector` to render."""
+    await _throttle(url)
+    await page.goto(url, **config.FAST_WAIT)
+    try:
+        await page.wait_for_selector(selector, timeout=config.READY_TIMEOUT)
+    except PwTimeout:
+        log.warning(f"Timeout waiting for {selector!r} on {url}")
+
+
+@functools.lru_cache(maxsize=8192)
 def _parse_number(text: str | None) -> int:
     """Parse '1.2K' / '12,426' / '12426' -> int."""
     if not text:
         return 0
     text = text.strip().replace(",", "").replace("\u00a0", "")
-    m = re.match(r"([\d.]+)\s*[kKкК]", text)
+    m = _K_SUFFIX_RE.match(text)
     if m:
         return int(float(m.group(1)) * 1000)
-    m = re.match(r"([\d.]+)\s*[mMмМ]", text)
+    m = _M_SUFFIX_RE.match(text)
     if m:
         return int(float(m.group(1)) * 1_000_000)
-    digits = re.sub(r"[^\d]", "", text)
+    digits = _NON_DIGIT_RE.sub("", text)
     return int(digits) if digits else 0
 
 
+@functools.lru_cache(maxsize=8192)
 def _extract_behance_id(url: str) -> str | None:
     """Extract gallery ID from URL like /gallery/242129829/..."""
-    m = re.search(r"/gallery/(\d+)/", url)
+    m = _GALLERY_ID_RE.search(url)
     return m.group(1) if m else None
 
 
+@functools.lru_cache(maxsize=8192)
 def _extract_username(url: str) -> str | None:
     """Extract username from profile URL like /valeriy_maslov"""
-    m = re.search(r"behance\.net/([^/?#]+)", url)
+    m = _USERNAME_RE.search(url)
     if m:
         name = m.group(1)
         if name not in ("search", "gallery", "for_you", "misc", "blog", "jobs"):
@@ -61,23 +126,91 @@ def _extract_username(url: str) -> str | None:
     return None
 
 
+@functools.lru_cache(maxsize=8192)
 def _extract_slug(url: str) -> str | None:
-    m = re.search(r"/gallery/\d+/([^?#]+)", url)
+    m = _SLUG_RE.search(url)
     return m.group(1) if m else None
 
 
-def _keyword_match_score(title: str, query: str) -> float:
-    """What fraction of query words appear in the title."""
-    if not title or not query:
-        return 0.0
-    title_lower = title.lower()
-    words = query.lower().split()
+def _query_words(query: str) -> tuple[str, ...]:
+    """Lowercased query words, computed once per query for _keyword_match_score."""
+    return tuple(query.lower().split())
+
+
+def _match_fraction(title_lower: str, words: tuple[str, ...]) -> float:
     if not words:
         return 0.0
-    matches = sum(1 for w in words if w in title_lower)
+    matches = sum(w in title_lower for w in words)
     return round(matches / len(words), 2)
 
 
+def _keyword_match_score(title: str, words: tuple[str, ...]) -> float:
+    """What fraction of query words (see _query_words) appear in the title."""
+    if not title:
+        return 0.0
+    return _match_fraction(title.lower(), words)
+
+
+def _best_keyword_match(title: str, word_lists) -> float:
+    """Best _keyword_match_score of `title` over several queries, lowercasing it once."""
+    if not title:
+        return 0.0
+    title_lower = title.lower()
+    return max((_match_fraction(title_lower, words) for words in word_lists), default=0.0)
+
+
+def _engagement_metrics(appreciations: int, views: int, published_date: str | None,
+                        now: datetime) -> dict:
+    """Engagement rate and per-day velocity of a search result, as of `now`."""
+    days = None
+    if published_date:
+        try:
+            days = (now - datetime.strptime(published_date, "%Y-%m-%d")).days
+        except ValueError:
+            pass
+    age = days if days and days > 0 else None
+    return {
+        "engagement_rate": appreciations / views if views > 0 else 0,
+        "appreciations_per_day": appreciations / age if age else 0,
+        "views_per_day": views / age if age else 0,
+    }
+
+
+# Start of a "tags"/"tools"/"fields":[...] array in raw HTML, found in a
+# single scan; the array itself is read with _JSON_DECODER.raw_decode, so
+# items with nested arrays or brackets inside strings still parse
+_META_KEY_RE = re.compile(r'"(tags|tools|fields)"\s*:\s*\[')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _next_data(html: str) -> dict | None:
+    """Parsed __NEXT_DATA__ JSON embedded in a page, or None if absent."""
+    start = html.find('id="__NEXT_DATA__"')
+    if start == -1:
+        return None
+    json_start = html.find(">", start) + 1
+    json_end = html.find("</script>", json_start)
+    if json_start == 0 or json_end == -1:
+        return None
+    try:
+        return json.loads(html[json_start:json_end])
+    except json.JSONDecodeError:
+        return None
+
+
+def _find_key(node, key: str):
+    """Yield every value stored under `key` anywhere in a parsed JSON tree."""
+    if isinstance(node, dict):
+        for k, v in node.items():
+            if k == key:
+                yield v
+            else:
+                yield from _find_key(v, key)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _find_key(v, key)
+
+
 MONTH_MAP = {
     "january": 1, "february": 2, "march": 3, "april": 4,
     "may": 5, "june": 6, "july": 7, "august": 8,
@@ -89,86 +222,42 @@ MONTH_MAP = {
 }
 
 
-def _parse_behance_date(text: str | None) -> tuple[str | None, int | None, int | None]:
+def _match_date(m: re.Match) -> datetime | None:
+    """Date from a _DATE_PATTERN match in either word order, or None."""
+    if m.group(1):
+        day, month_name = m.group(1), m.group(2)
+    else:
+        day, month_name = m.group(4), m.group(3)
+    month = MONTH_MAP.get(month_name.lower())
+    if not month:
+        return None
+    try:
+        return datetime(int(m.group(5)), month, int(day))
+    except ValueError:
+        return None
+
+
+def _parse_behance_date(m: re.Match) -> tuple[str | None, int | None, int | None]:
     """
-    Parse date from Behance project page.
+    Parse a _PUBLISHED_RE match from a Behance project page.
     EN: 'Published: January 13th 2026'
     RU: 'Опубликовано: 13 января 2026 г.'
     Returns (iso_date, day_of_week, hour).
     """
-    if not text:
+    dt = _match_date(m)
+    if not dt:
         return None, None, None
+    return dt.strftime("%Y-%m-%d"), dt.isoweekday(), None
 
-    # Remove prefix keywords
-    for prefix in ["Published:", "Опубликовано:"]:
-        text = text.replace(prefix, "")
-    text = text.replace("г.", "").strip()
-    text = re.sub(r"(\d+)(st|nd|rd|th)", r"\1", text)
-    parts = text.split()
-    if len(parts) < 3:
-        return None, None, None
 
-    # Try RU format: "13 января 2026"
-    try:
-        if parts[1].lower() in MONTH_MAP:
-            day = int(parts[0])
-            month = MONTH_MAP[parts[1].lower()]
-            year = int(parts[2])
-            dt = datetime(year, month, day)
-            return dt.strftime("%Y-%m-%d"), dt.isoweekday(), None
-    except (ValueError, IndexError):
-        pass
-
-    # Try EN format: "January 13 2026"
-    month_str = parts[0].lower()
-    month = MONTH_MAP.get(month_str)
-    if not month:
-        return None, None, None
-    try:
-        day = int(parts[1])
-        year = int(parts[2])
-        dt = datetime(year, month, day)
-        return dt.strftime("%Y-%m-%d"), dt.isoweekday(), None
-    except (ValueError, IndexError):
-        return None, None, None
-
-
-def _parse_member_since(text: str | None) -> str | None:
+def _parse_member_since(m: re.Match) -> str | None:
     """
-    Parse member since date.
+    Parse a _MEMBER_SINCE_RE match.
     EN: 'Member Since: February 12, 2024'
     RU: 'Участник с: 12 февраля 2024 г.' or similar
     """
-    if not text:
-        return None
-    for prefix in ["Member Since:", "Участник с:", "На Behance с:"]:
-        text = text.replace(prefix, "")
-    text = text.replace(",", "").replace("г.", "").strip()
-    parts = text.split()
-    if len(parts) < 3:
-        return None
-
-    # Try RU: "12 февраля 2024"
-    try:
-        if len(parts) >= 3 and parts[1].lower() in MONTH_MAP:
-            day = int(parts[0])
-            month = MONTH_MAP[parts[1].lower()]
-            year = int(parts[2])
-            return f"{year}-{month:02d}-{day:02d}"
-    except (ValueError, IndexError):
-        pass
-
-    # Try EN: "February 12 2024"
-    month_str = parts[0].lower()
-    month = MONTH_MAP.get(month_str)
-    if not month:
-        return None
-    try:
-        day = int(parts[1])
-        year = int(parts[2])
-        return f"{year}-{month:02d}-{day:02d}"
-    except (ValueError, IndexError):
-        return None
+    dt = _match_date(m)
+    return dt.strftime("%Y-%m-%d") if dt else None
 
 
 # ---------------------------------------------------------------------------
@@ -189,7 +278,8 @@ async def scrape_search_results(page: Page, query: str, max_projects: int = 100)
 
     for page_num in range(config.PAGES_PER_QUERY):
         if page_num == 0:
-            await page.goto(url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
+            await _throttle(url)
+            await page.goto(url, **config.FAST_WAIT)
         else:
             next_btn = page.locator('a:has-text("Next")')
             if await next_btn.count() == 0:
@@ -200,9 +290,8 @@ async def scrape_search_results(page: Page, query: str, max_projects: int = 100)
                 break
             if not next_url.startswith("http"):
                 next_url = config.BEHANCE_BASE_URL + next_url
-            await page.goto(next_url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
-
-        await asyncio.sleep(_rand_delay())
+            await _throttle(next_url)
+            await page.goto(next_url, **config.FAST_WAIT)
 
         # Wait for project cards to load
         try:
@@ -211,11 +300,12 @@ async def scrape_search_results(page: Page, query: str, max_projects: int = 100)
             log.warning(f"No project cards found on page {page_num + 1}")
             break
 
-        cards = await page.query_selector_all('[class*="ProjectCover-root"]')
-        if not cards:
-            cards = await page.query_selector_all('[class*="ProjectCoverNeue"]')
-        if not cards:
-            cards = await page.query_selector_all('div[class*="Cover"]')
+        # Pull every card's fields in one round-trip instead of ~10 per card
+        cards = []
+        for selector in _CARD_SELECTORS:
+            cards = await page.eval_on_selector_all(selector, _CARD_JS)
+            if cards:
+                break
 
         log.info(f"Page {page_num + 1}: found {len(cards)} cards")
 
@@ -224,47 +314,64 @@ async def scrape_search_results(page: Page, query: str, max_projects: int = 100)
             if position > max_projects:
                 break
 
-            project_data = await _parse_search_card(card, position)
+            project_data = _parse_search_card(card, position)
             if project_data:
                 results.append(project_data)
 
         if position >= max_projects:
             break
 
-        await asyncio.sleep(_rand_delay())
-
     log.info(f"Total collected for '{query}': {len(results)} projects")
     return results
 
 
-async def _parse_search_card(card, position: int) -> dict | None:
-    """Parse a single project card from search results."""
+_CARD_SELECTORS = (
+    '[class*="ProjectCover-root"]',
+    '[class*="ProjectCoverNeue"]',
+    'div[class*="Cover"]',
+)
+
+# Runs in the browser over all matched cards; returns the raw fields that
+# _parse_search_card needs
+_CARD_JS = """els => els.map(el => {
+    const link = el.querySelector("a[href*='/gallery/']");
+    const titleEl = el.querySelector('[class*="Title"]');
+    const author = el.querySelector('a[href*="behance.net/"]:not([href*="/gallery/"])');
+    const img = el.querySelector("img");
+    return {
+        href: link ? link.getAttribute("href") || "" : null,
+        title: link?.getAttribute("title") || (titleEl ? titleEl.innerText.trim() : ""),
+        author_href: author ? author.getAttribute("href") || "" : null,
+        author_name: author ? author.innerText.trim() : null,
+        text: el.innerText,
+        promoted: !!el.querySelector('a[href*="promoted"], [class*="romoted"]'),
+        featured: !!el.querySelector('[class*="Featured"], [class*="featured"], [class*="Curated"]'),
+        cover: img ? img.getAttribute("src") || img.getAttribute("srcset") : null,
+    };
+})"""
+
+
+def _parse_search_card(card: dict, position: int) -> dict | None:
+    """Parse a single project card (as returned by _CARD_JS) from search results."""
     try:
-        link_el = await card.query_selector("a[href*='/gallery/']")
-        if not link_el:
+        href = card["href"]
+        if href is None:
             return None
 
-        href = await link_el.get_attribute("href") or ""
         behance_id = _extract_behance_id(href)
         if not behance_id:
             return None
 
-        title = await link_el.get_attribute("title") or ""
-        if not title:
-            title_el = await card.query_selector('[class*="Title"]')
-            if title_el:
-                title = (await title_el.inner_text()).strip()
+        title = card["title"]
 
         full_url = href if href.startswith("http") else config.BEHANCE_BASE_URL + href
 
         # Author
-        author_el = await card.query_selector('a[href*="behance.net/"]:not([href*="/gallery/"])')
         author_username = None
         author_name = None
-        if author_el:
-            author_href = await author_el.get_attribute("href") or ""
-            author_username = _extract_username(author_href)
-            author_name = (await author_el.inner_text()).strip()
+        if card["author_href"] is not None:
+            author_username = _extract_username(card["author_href"])
+            author_name = card["author_name"]
 
         # Stats — parse from card inner text
         # RU: "Оценок: 277 за ..." / "Оценка: 1 за ..." / "Оценки: 3 за ..."
@@ -273,63 +380,28 @@ async def _parse_search_card(card, position: int) -> dict | None:
         appr_val = 0
         views_val = 0
 
-        card_text = await card.inner_text()
+        card_text = card["text"]
 
-        # Russian: match Оценок/Оценка/Оценки (all grammatical forms)
-        appr_match = re.search(
-            "[Оо]ценок|[Оо]ценка|[Оо]ценки",
-            card_text,
-        )
-        if appr_match:
-            # Get the number that follows the colon
-            after_keyword = card_text[appr_match.start():]
-            num_match = re.search(r":\s*([\d\s\xa0,.]+)", after_keyword)
-            if num_match:
-                appr_val = _parse_number(num_match.group(1).replace("\xa0", "").strip())
-
-        # Russian: match Просмотров/Просмотр/Просмотра
-        views_match = re.search(
-            "[Пп]росмотров|[Пп]росмотр[аы]?",
-            card_text,
-        )
-        if views_match:
-            after_keyword = card_text[views_match.start():]
-            num_match = re.search(r":\s*([\d\s\xa0,.]+)", after_keyword)
-            if num_match:
-                views_val = _parse_number(num_match.group(1).replace("\xa0", "").strip())
-
-        # English fallback
-        if appr_val == 0:
-            en_appr = re.search(r"([\d,.]+)\s*appreciations?\s+for", card_text, re.IGNORECASE)
-            if en_appr:
-                appr_val = _parse_number(en_appr.group(1))
-
-        if views_val == 0:
-            en_views = re.search(r"([\d,.]+)\s*views?\s+for", card_text, re.IGNORECASE)
-            if en_views:
-                views_val = _parse_number(en_views.group(1))
+        # Russian: match Оценок/Оценка/Оценки (all grammatical forms), then the
+        # English fallback only when there's no Russian label at all (a
+        # matched 0 is a real count, not a failed parse)
+        num_match = _APPR_RU_RE.search(card_text) or _APPR_EN_RE.search(card_text)
+        if num_match:
+            appr_val = _parse_number(num_match.group(1).replace("\xa0", "").strip())
+
+        # Russian: match Просмотров/Просмотр/Просмотра; English fallback as above
+        num_match = _VIEWS_RU_RE.search(card_text) or _VIEWS_EN_RE.search(card_text)
+        if num_match:
+            views_val = _parse_number(num_match.group(1).replace("\xa0", "").strip())
 
         # Promoted check — look for "promoted" text or link to help article about promoted
-        is_promoted = 0
-        promoted_el = await card.query_selector('a[href*="promoted"], [class*="romoted"]')
-        if promoted_el:
-            is_promoted = 1
-        else:
-            card_full_text = await card.inner_text()
-            if "promoted" in card_full_text.lower():
-                is_promoted = 1
+        is_promoted = 1 if card["promoted"] or "promoted" in card_text.lower() else 0
 
         # Featured check
-        is_featured = 0
-        featured_el = await card.query_selector('[class*="Featured"], [class*="featured"], [class*="Curated"]')
-        if featured_el:
-            is_featured = 1
+        is_featured = 1 if card["featured"] else 0
 
         # Cover image
-        cover_url = None
-        img_el = await card.query_selector("img")
-        if img_el:
-            cover_url = await img_el.get_attribute("src") or await img_el.get_attribute("srcset")
+        cover_url = card["cover"]
 
         return {
             "position": position,
@@ -354,107 +426,135 @@ async def _parse_search_card(card, position: int) -> dict | None:
 # Project detail scraping
 # ---------------------------------------------------------------------------
 
+# eval_on_selector_all callbacks: one round-trip for all matched elements
+_INNER_TEXTS_JS = "els => els.map(el => el.innerText.trim())"
+_HREFS_JS = 'els => els.map(el => el.getAttribute("href") || "")'
+
+# Everything scrape_project_details reads from the rendered page, gathered
+# in a single round-trip: body text, serialized HTML and the DOM lookups
+# (the tag/tool/field lists are only used when the embedded JSON has none)
+_PROJECT_DOM_JS = """() => {
+    const all = sel => Array.from(document.querySelectorAll(sel));
+    const texts = sel => all(sel).map(el => el.innerText.trim());
+    // Same substring tests the scraper used to run on each module's inner_html
+    const moduleKind = el => {
+        const html = el.innerHTML;
+        const lower = html.toLowerCase();
+        if (html.includes("<img") || lower.includes("image")) return "image";
+        if (html.includes("<video") || lower.includes("video")) return "video";
+        if (html.includes("<iframe") || lower.includes("embed")) return "embed";
+        return null;
+    };
+    const doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : "";
+    return {
+        text: document.body.innerText,
+        html: doctype + document.documentElement.outerHTML,
+        tag_texts: texts('a[href*="tracking_source=project_tag"]'),
+        tool_texts: texts('a[href*="tools="]'),
+        field_texts: texts('a[href*="field="]'),
+        module_kinds: all('[class*="Permalink"], [class*="module"]').map(moduleKind),
+        permalink_count: all('a[href*="/modules/"]').length,
+        desc_parts: texts('[class*="Description"], [class*="ProjectText"]'),
+        owner_hrefs: all('[class*="Owner"] a[href*="behance.net/"]').map(el => el.getAttribute("href") || ""),
+        featured: all('[class*="Featured"], [class*="featured-badge"]').length > 0,
+        external_link_count: all("a[href]").filter(el => {
+            const href = el.getAttribute("href");
+            return href.startsWith("http") && !href.includes("behance.net");
+        }).length,
+    };
+}"""
+
+
 async def scrape_project_details(page: Page, project_url: str, query: str = "") -> dict:
     """Scrape detailed info from a project page."""
-    log.info(f"Scraping project: {project_url}")
+    log.debug("Scraping project: %s", project_url)
 
-    try:
-        await page.goto(project_url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
-    except PwTimeout:
-        log.warning(f"Timeout loading project: {project_url}")
-        await page.goto(project_url, wait_until="domcontentloaded", timeout=config.NAVIGATION_TIMEOUT)
-
-    await asyncio.sleep(_rand_delay())
+    await _goto_ready(page, project_url, config.PROJECT_READY_SELECTOR)
 
     data = {}
+    dom = await page.evaluate(_PROJECT_DOM_JS)
 
     # Published date
-    page_text = await page.inner_text("body")
+    page_text = dom["text"]
 
     # RU: "Опубликовано: 13 января 2026 г." or EN: "Published: January 13th 2026"
-    date_match = re.search(
-        r"(?:Опубликовано|Published):\s*(.+?\d{4})\s*г?\.?",
-        page_text,
-    )
+    date_match = _PUBLISHED_RE.search(page_text)
     if date_match:
-        pub_date, dow, hour = _parse_behance_date(date_match.group(0))
+        pub_date, dow, hour = _parse_behance_date(date_match)
         data["published_date"] = pub_date
         data["publish_day_of_week"] = dow
         data["publish_hour"] = hour
 
     # Tags + Tools — extract from embedded JSON in <script> tags (most reliable)
-    html_source = await page.content()
+    html_source = dom["html"]
     tags = []
     tools = []
 
-    # Parse tags from JSON: "tags":[{"id":123,"title":"design"},...]
-    tags_json_match = re.findall(r'"tags"\s*:\s*\[(.*?)\]', html_source)
-    for match in tags_json_match:
-        if not match:
+    next_data = _next_data(html_source)
+
+    # One pass over the HTML collects every "tags", "tools" and "fields"
+    # array; tags are only decoded when there's no __NEXT_DATA__ to walk
+    meta_lists = {"tags": [], "tools": [], "fields": []}
+    for m in _META_KEY_RE.finditer(html_source):
+        key = m.group(1)
+        if key == "tags" and next_data is not None:
             continue
         try:
-            items = json.loads(f"[{match}]")
-            for item in items:
-                if isinstance(item, dict) and "title" in item:
-                    tag_title = item["title"].strip()
-                    if tag_title and tag_title not in tags:
-                        tags.append(tag_title)
-        except (json.JSONDecodeError, TypeError):
-            pass
+            arr, _ = _JSON_DECODER.raw_decode(html_source, m.end() - 1)
+        except json.JSONDecodeError:
+            continue
+        if arr:
+            meta_lists[key].append(arr)
+
+    # Parse tags from JSON: "tags":[{"id":123,"title":"design"},...]
+    # Walk the parsed __NEXT_DATA__ payload when the page has one; otherwise
+    # use the "tags" arrays from the raw HTML
+    if next_data is not None:
+        tag_lists = _find_key(next_data, "tags")
+    else:
+        tag_lists = meta_lists["tags"]
+    for items in tag_lists:
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("title"), str):
+                tag_title = item["title"].strip()
+                if tag_title and tag_title not in tags:
+                    tags.append(tag_title)
 
     # Fallback: CSS selector
     if not tags:
-        tag_links = await page.query_selector_all('a[href*="tracking_source=project_tag"]')
-        for tl in tag_links:
-            tag_text = (await tl.inner_text()).strip()
+        for tag_text in dom["tag_texts"]:
             if tag_text and tag_text not in tags:
                 tags.append(tag_text)
 
     data["tags"] = tags
 
     # Parse tools from JSON: "tools":[{"id":123,"title":"Photoshop",...},...]
-    tools_json_match = re.findall(r'"tools"\s*:\s*\[(.*?)\]', html_source)
-    for match in tools_json_match:
-        if not match:
-            continue
-        try:
-            items = json.loads(f"[{match}]")
-            for item in items:
-                if isinstance(item, dict) and "title" in item:
-                    tool_title = item["title"].strip()
-                    if tool_title and tool_title not in tools:
-                        tools.append(tool_title)
-        except (json.JSONDecodeError, TypeError):
-            pass
+    for items in meta_lists["tools"]:
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("title"), str):
+                tool_title = item["title"].strip()
+                if tool_title and tool_title not in tools:
+                    tools.append(tool_title)
 
     # Fallback: CSS selector
     if not tools:
-        tool_links = await page.query_selector_all('a[href*="tools="]')
-        for tl in tool_links:
-            tool_text = (await tl.inner_text()).strip()
+        for tool_text in dom["tool_texts"]:
             if tool_text and tool_text not in tools:
                 tools.append(tool_text)
 
     data["tools_used"] = json.dumps(tools, ensure_ascii=False) if tools else None
 
-    # Modules (content blocks)
-    modules = await page.query_selector_all('[class*="Permalink"], [class*="module"]')
-    image_count = 0
-    video_count = 0
+    # Modules (content blocks), classified in the browser
+    module_kinds = dom["module_kinds"]
+    image_count = module_kinds.count("image")
+    video_count = module_kinds.count("video")
     text_count = 0
-    embed_count = 0
-
-    for mod in modules:
-        mod_html = await mod.inner_html()
-        if "<img" in mod_html or "image" in mod_html.lower():
-            image_count += 1
-        elif "<video" in mod_html or "video" in mod_html.lower():
-            video_count += 1
-        elif "<iframe" in mod_html or "embed" in mod_html.lower():
-            embed_count += 1
+    embed_count = module_kinds.count("embed")
 
     # Alternative: count by Permalink links (each = 1 module)
-    permalink_count = await page.locator('a[href*="/modules/"]').count()
+    permalink_count = dom["permalink_count"]
     if permalink_count > 0:
         data["module_count"] = permalink_count
         data["image_count"] = max(image_count, permalink_count - video_count - text_count - embed_count)
@@ -467,70 +567,51 @@ async def scrape_project_details(page: Page, project_url: str, query: str = "")
     data["embed_count"] = embed_count
 
     # Description / text blocks
-    desc_els = await page.query_selector_all('[class*="Description"], [class*="ProjectText"]')
-    desc_text = ""
-    for d in desc_els:
-        desc_text += (await d.inner_text()).strip() + " "
-    desc_text = desc_text.strip()
+    desc_text = " ".join(dom["desc_parts"]).strip()
     data["description_length"] = len(desc_text)
     if query:
+        desc_lower = desc_text.lower()
         data["description_has_query_keywords"] = 1 if any(
-            w.lower() in desc_text.lower() for w in query.split()
+            w in desc_lower for w in _query_words(query)
         ) else 0
 
     # External links
-    all_links = await page.query_selector_all('a[href]')
-    external_count = 0
-    for lnk in all_links:
-        href = await lnk.get_attribute("href") or ""
-        if href and not "behance.net" in href and href.startswith("http"):
-            external_count += 1
+    external_count = dom["external_link_count"]
     data["has_external_links"] = 1 if external_count > 0 else 0
     data["external_link_count"] = external_count
 
     # Comments count — from embedded JSON ("commentCount":79)
-    comment_match = re.search(r'"commentCount"\s*:\s*(\d+)', html_source)
+    comment_match = _COMMENT_COUNT_RE.search(html_source)
     if comment_match:
         data["comments_count"] = int(comment_match.group(1))
 
     # Also extract appreciations from JSON if available (more reliable)
-    appr_json = re.search(r'"stats"\s*:\s*\{\s*"appreciations"\s*:\s*\{\s*"all"\s*:\s*(\d+)', html_source)
+    appr_json = _STATS_APPR_RE.search(html_source)
     if appr_json:
         data["json_appreciations"] = int(appr_json.group(1))
 
     # Co-owners
-    owner_links = await page.query_selector_all('[class*="Owner"] a[href*="behance.net/"]')
     co_owners = set()
-    for ol in owner_links:
-        uname = _extract_username(await ol.get_attribute("href") or "")
+    for href in dom["owner_hrefs"]:
+        uname = _extract_username(href)
         if uname:
             co_owners.add(uname)
     data["co_owners_count"] = max(0, len(co_owners) - 1)  # minus primary owner
 
     # Featured badge
-    featured_indicators = await page.query_selector_all('[class*="Featured"], [class*="featured-badge"]')
-    data["is_featured"] = 1 if len(featured_indicators) > 0 else 0
+    data["is_featured"] = 1 if dom["featured"] else 0
 
     # Creative fields — from JSON or CSS
     creative_fields = []
-    fields_json_match = re.findall(r'"fields"\s*:\s*\[(.*?)\]', html_source)
-    for match in fields_json_match:
-        if not match:
-            continue
-        try:
-            items = json.loads(f"[{match}]")
-            for item in items:
-                if isinstance(item, dict):
-                    label = item.get("label") or item.get("title") or item.get("name", "")
-                    if label and label not in creative_fields:
-                        creative_fields.append(label.strip())
-        except (json.JSONDecodeError, TypeError):
-            pass
+    for items in meta_lists["fields"]:
+        for item in items:
+            if isinstance(item, dict):
+                label = item.get("label") or item.get("title") or item.get("name", "")
+                if isinstance(label, str) and label and label not in creative_fields:
+                    creative_fields.append(label.strip())
 
     if not creative_fields:
-        cf_links = await page.query_selector_all('a[href*="field="]')
-        for cf in cf_links:
-            cf_text = (await cf.inner_text()).strip()
+        for cf_text in dom["field_texts"]:
             if cf_text and cf_text not in creative_fields:
                 creative_fields.append(cf_text)
 
@@ -546,15 +627,9 @@ async def scrape_project_details(page: Page, project_url: str, query: str = "")
 async def scrape_author_profile(page: Page, username: str) -> dict:
     """Scrape author profile page for stats and metadata."""
     profile_url = f"{config.BEHANCE_BASE_URL}/{username}"
-    log.info(f"Scraping profile: {profile_url}")
+    log.debug("Scraping profile: %s", profile_url)
 
-    try:
-        await page.goto(profile_url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
-    except PwTimeout:
-        log.warning(f"Timeout loading profile: {profile_url}")
-        await page.goto(profile_url, wait_until="domcontentloaded", timeout=config.NAVIGATION_TIMEOUT)
-
-    await asyncio.sleep(_rand_delay())
+    await _goto_ready(page, profile_url, config.PROFILE_READY_SELECTOR)
 
     page_text = await page.inner_text("body")
     data = {"username": username, "url": profile_url}
@@ -570,12 +645,9 @@ async def scrape_author_profile(page: Page, username: str) -> dict:
         data["location"] = (await loc_el.inner_text()).strip()
 
     # Member since (EN: "Member Since: February 12, 2024", RU: various)
-    ms_match = re.search(
-        r"(?:Member Since|Участник с|На Behance с):\s*(.+?\d{4})",
-        page_text,
-    )
+    ms_match = _MEMBER_SINCE_RE.search(page_text)
     if ms_match:
-        data["member_since"] = _parse_member_since(ms_match.group(0))
+        data["member_since"] = _parse_member_since(ms_match)
 
     # Bio — try multiple selectors
     bio_text = ""
@@ -587,7 +659,7 @@ async def scrape_author_profile(page: Page, username: str) -> dict:
                 break
     if not bio_text:
         # Try finding "Обо мне" or "Read More" section
-        about_match = re.search(r"(?:Обо мне|About)\n(.+?)(?:\n|Read More|Подробнее)", page_text, re.DOTALL)
+        about_match = _ABOUT_RE.search(page_text)
         if about_match:
             bio_text = about_match.group(1).strip()
     if bio_text:
@@ -596,31 +668,36 @@ async def scrape_author_profile(page: Page, username: str) -> dict:
     # Stats table — RU: "Просмотры проекта", "Оценки", "Подписчики", "Подписки"
     #               EN: "Project Views", "Appreciations", "Followers", "Following"
     stats = {}
-    stats_rows = await page.query_selector_all("table tr")
-    for row in stats_rows:
-        row_text = (await row.inner_text()).strip().replace("\xa0", "")
-        nums = re.findall(r"\d+", row_text)
+    for row_text in await page.eval_on_selector_all("table tr", _INNER_TEXTS_JS):
+        row_text = row_text.replace("\xa0", "")
+        nums = _DIGITS_RE.findall(row_text)
         if not nums:
             continue
         num_val = int("".join(nums))
-        row_lower = row_text.lower()
-        if any(w in row_lower for w in ["просмотры", "project views", "views"]):
+        # Which stat groups the row mentions, in one scan of the row
+        found = {m.lastindex for m in _STAT_KEYWORD_RE.finditer(row_text.lower())}
+        if 1 in found:
             stats["total_views"] = num_val
-        elif any(w in row_lower for w in ["оценки", "appreciat"]):
+        elif 2 in found:
             stats["total_appreciations"] = num_val
-        elif any(w in row_lower for w in ["подписчики", "follower"]) and "подписки" not in row_lower and "following" not in row_lower:
+        elif 3 in found and 4 not in found:
             stats["followers"] = num_val
-        elif any(w in row_lower for w in ["подписки", "following"]):
+        elif 4 in found:
             stats["following"] = num_val
 
     # Fallback: parse from links
     if not stats.get("total_views"):
-        analytics_links = await page.query_selector_all('a[href*="/analytics"]')
+        analytics_links = await page.eval_on_selector_all(
+            'a[href*="/analytics"]',
+            """els => els.map(el => ({
+                text: el.innerText.trim(),
+                parent: el.closest('tr')?.innerText || el.parentElement?.innerText || '',
+            }))""",
+        )
         for al in analytics_links:
-            al_text = (await al.inner_text()).strip()
-            num = _parse_number(al_text)
+            num = _parse_number(al["text"])
             if num > 0:
-                parent = await al.evaluate("el => el.closest('tr')?.innerText || el.parentElement?.innerText || ''")
+                parent = al["parent"]
                 if any(w in parent for w in ["Просмотры", "View", "view"]):
                     stats["total_views"] = num
                 elif any(w in parent for w in ["Оценки", "Appreciat", "appreciat"]):
@@ -689,9 +766,7 @@ async def scrape_author_profile(page: Page, username: str) -> dict:
     data["has_website_link"] = 0
     user_info = await page.query_selector('[class*="UserInfo-root"], [class*="ProfileCard-userDetailsContainer"]')
     if user_info:
-        links = await user_info.query_selector_all('a[href*="http"]')
-        for link in links:
-            href = await link.get_attribute("href") or ""
+        for href in await user_info.eval_on_selector_all('a[href*="http"]', _HREFS_JS):
             if "behance.net" not in href and "adobe.com" not in href:
                 data["has_website_link"] = 1
                 break
@@ -721,10 +796,8 @@ async def scrape_author_profile(page: Page, username: str) -> dict:
     data["profile_completeness"] = min(score, 100)
 
     # Count visible projects
-    project_cards = await page.query_selector_all('a[href*="/gallery/"]')
     project_ids = set()
-    for pc in project_cards:
-        href = await pc.get_attribute("href") or ""
+    for href in await page.eval_on_selector_all('a[href*="/gallery/"]', _HREFS_JS):
         pid = _extract_behance_id(href)
         if pid:
             project_ids.add(pid)
@@ -737,41 +810,47 @@ async def scrape_author_profile(page: Page, username: str) -> dict:
 # My profile projects
 # ---------------------------------------------------------------------------
 
+# Runs in the browser over every gallery link on a profile page
+_MY_CARD_JS = """els => els.map(el => {
+    const titleEl = el.querySelector('[class*="Title"]');
+    return {
+        href: el.getAttribute("href") || "",
+        title: el.getAttribute("title") || (titleEl ? titleEl.innerText.trim() : ""),
+        parent_text: el.closest('[class*="ProjectCover"]')?.innerText || el.parentElement?.innerText || "",
+    };
+})"""
+
+
 async def scrape_my_projects(page: Page, profile_url: str) -> list[dict]:
     """Scrape all project IDs and basic info from my profile."""
     log.info(f"Scraping my projects: {profile_url}")
 
-    await page.goto(profile_url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
-    await asyncio.sleep(_rand_delay())
+    await _goto_ready(page, profile_url, config.PROFILE_PROJECTS_SELECTOR)
 
     projects = []
     seen_ids = set()
 
     while True:
-        cards = await page.query_selector_all('a[href*="/gallery/"]')
+        cards = await page.eval_on_selector_all(config.PROFILE_PROJECTS_SELECTOR, _MY_CARD_JS)
         new_found = False
 
         for card in cards:
-            href = await card.get_attribute("href") or ""
+            href = card["href"]
             behance_id = _extract_behance_id(href)
             if not behance_id or behance_id in seen_ids:
                 continue
             seen_ids.add(behance_id)
             new_found = True
 
-            title = await card.get_attribute("title") or ""
-            if not title:
-                title_el = await card.query_selector('[class*="Title"]')
-                if title_el:
-                    title = (await title_el.inner_text()).strip()
+            title = card["title"]
 
             full_url = href if href.startswith("http") else config.BEHANCE_BASE_URL + href
 
             # Stats from card
-            parent = await card.evaluate("el => el.closest('[class*=\"ProjectCover\"]')?.innerText || el.parentElement?.innerText || ''")
+            parent = card["parent_text"]
             appr = 0
             views = 0
-            nums = re.findall(r"([\d,.]+[kKмМ]?)", parent)
+            nums = _CARD_NUMS_RE.findall(parent)
             if len(nums) >= 2:
                 appr = _parse_number(nums[-2])
                 views = _parse_number(nums[-1])
@@ -793,8 +872,7 @@ async def scrape_my_projects(page: Page, profile_url: str) -> list[dict]:
             if next_url:
                 if not next_url.startswith("http"):
                     next_url = config.BEHANCE_BASE_URL + next_url
-                await page.goto(next_url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
-                await asyncio.sleep(_rand_delay())
+                await _goto_ready(page, next_url, config.PROFILE_PROJECTS_SELECTOR)
                 continue
         break
 
@@ -806,6 +884,112 @@ async def scrape_my_projects(page: Page, profile_url: str) -> list[dict]:
 # Main orchestration
 # ---------------------------------------------------------------------------
 
+_CONTEXT_OPTIONS = {
+    "user_agent": config.USER_AGENT,
+    "viewport": {"width": 1920, "height": 1080},
+    "locale": "ru-RU",
+    "timezone_id": "Europe/Moscow",
+}
+
+# Requests the scraper never needs. Stylesheets stay: innerText, which the
+# card/profile parsing reads, depends on layout. Search pages keep images
+# since cover URLs come from them.
+_TRACKER_HOSTS = ("google-analytics", "googletagmanager", "doubleclick", "adobe.com/target")
+_SEARCH_BLOCKED_TYPES = frozenset({"font", "media"})
+_DETAIL_BLOCKED_TYPES = frozenset({"image", "font", "media"})
+
+
+async def _block_requests(context, resource_types: frozenset[str]):
+    """Abort `resource_types` and tracker requests for every page of `context`."""
+    async def handle(route):
+        request = route.request
+        if request.resource_type in resource_types or any(h in request.url for h in _TRACKER_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+
+
+_PROGRESS_EVERY = 25
+
+
+async def _run_pool(browser: Browser, jobs, handler, what: str = "jobs"):
+    """
+    Run `await handler(page, job)` for every job, spread over
+    config.SCRAPE_CONCURRENCY pages that each live in their own browser
+    context. Pages spend most of their time waiting on the network, so
+    this overlaps those waits instead of visiting URLs one at a time.
+    Progress is logged every _PROGRESS_EVERY finished jobs.
+    """
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    total = queue.qsize()
+    done = 0
+
+    async def new_page(context):
+        page = await context.new_page()
+        page.set_default_timeout(config.REQUEST_TIMEOUT)
+        return page
+
+    async def worker():
+        nonlocal done
+        context = await browser.new_context(**_CONTEXT_OPTIONS)
+        try:
+            await _block_requests(context, _DETAIL_BLOCKED_TYPES)
+            page = await new_page(context)
+            while True:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                await handler(page, job)
+                done += 1
+                if done % _PROGRESS_EVERY == 0 or done == total:
+                    log.info("  [%d/%d] %s done", done, total, what)
+                # Drop the previous page's DOM and scripts before the next job;
+                # a crashed or hung page is replaced instead of ending the worker
+                try:
+                    await page.goto("about:blank")
+                except Exception as e:
+                    log.warning(f"Page reset failed, opening a new page: {e}")
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                    page = await new_page(context)
+        finally:
+            await context.close()
+
+    workers = min(config.SCRAPE_CONCURRENCY, queue.qsize())
+    # A worker that still fails (e.g. its context died) only loses its own
+    # place in the pool; the others drain the queue and the run goes on to save
+    results = await asyncio.gather(*(worker() for _ in range(workers)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            log.error(f"Scrape worker for {what} failed: {result}")
+
+
+@asynccontextmanager
+async def _scrape_session():
+    """
+    Launch the one browser used for a whole run and yield it with the main
+    page (search, my projects, tracking). The browser is closed even if the
+    run fails, so no Chromium processes are left behind.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context(**_CONTEXT_OPTIONS)
+            await _block_requests(context, _SEARCH_BLOCKED_TYPES)
+            page = await context.new_page()
+            page.set_default_timeout(config.REQUEST_TIMEOUT)
+            yield browser, page
+        finally:
+            await browser.close()
+
+
 async def run_full_scrape(queries: list[str] | None = None, include_secondary: bool = False):
     """
     Full scrape pipeline:
@@ -822,21 +1006,13 @@ async def run_full_scrape(queries: list[str] | None = None, include_secondary: b
         if include_secondary:
             queries.extend(config.SEARCH_QUERIES["secondary"])
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=config.USER_AGENT,
-            viewport={"width": 1920, "height": 1080},
-            locale="ru-RU",
-            timezone_id="Europe/Moscow",
-        )
-        page = await context.new_page()
-        page.set_default_timeout(config.REQUEST_TIMEOUT)
-
+    async with _scrape_session() as (browser, page):
         all_search_data = {}
         all_projects = {}
         all_authors = {}
 
+        query_words = {q: _query_words(q) for q in queries}
+
         # 1. Search results
         for query in queries:
             snapshot_id = db.create_snapshot(query, config.SORT_TYPE)
@@ -845,7 +1021,7 @@ async def run_full_scrape(queries: list[str] | None = None, include_secondary: b
             for r in results:
                 r["snapshot_id"] = snapshot_id
                 r["query"] = query
-                r["title_keyword_match"] = _keyword_match_score(r.get("title", ""), query)
+                r["title_keyword_match"] = _keyword_match_score(r.get("title", ""), query_words[query])
 
                 pid = r["behance_id"]
                 if pid not in all_projects:
@@ -871,10 +1047,7 @@ async def run_full_scrape(queries: list[str] | None = None, include_secondary: b
             else:
                 all_projects[pid]["is_my_project"] = 1
             # Calculate keyword match for my projects against all queries
-            best_match = 0.0
-            for q in queries:
-                score = _keyword_match_score(mp.get("title", ""), q)
-                best_match = max(best_match, score)
+            best_match = _best_keyword_match(mp.get("title", ""), query_words.values())
             all_projects.setdefault(pid, mp)["title_keyword_match"] = best_match
 
         if my_username not in all_authors:
@@ -882,96 +1055,182 @@ async def run_full_scrape(queries: list[str] | None = None, include_secondary: b
 
         # 3. Project details
         log.info(f"Scraping details for {len(all_projects)} projects...")
-        project_db_ids = {}
 
-        for i, (pid, pdata) in enumerate(all_projects.items()):
+        page_cache = db.get_page_cache(config.PAGE_CACHE_TTL) if config.PAGE_CACHE_TTL else {}
+        fetched = []  # (url, query, details) written to page_cache after the pool
+        jobs = []
+        for pid, pdata in all_projects.items():
             purl = pdata.get("url")
             if not purl:
                 continue
-
             query_for_project = pdata.get("query", queries[0] if queries else "")
+            cached = page_cache.get((purl, query_for_project))
+            if cached is not None:
+                pdata.update(cached)
+            else:
+                jobs.append((pid, pdata, query_for_project))
+        if len(jobs) < len(all_projects):
+            log.info(f"  {len(all_projects) - len(jobs)} projects served from page cache")
+
+        async def scrape_project(page, job):
+            pid, pdata, query_for_project = job
+            purl = pdata["url"]
 
             try:
                 details = await scrape_project_details(page, purl, query_for_project)
                 pdata.update(details)
+                fetched.append((purl, query_for_project, details))
             except Exception as e:
                 log.warning(f"Error scraping project {pid}: {e}")
 
-            log.info(f"  [{i+1}/{len(all_projects)}] {pdata.get('title', pid)}")
+        await _run_pool(browser, jobs, scrape_project, "projects")
+        if config.PAGE_CACHE_TTL:
+            db.put_page_cache_many(fetched, config.PAGE_CACHE_TTL)
 
         # 4. Author profiles
         log.info(f"Scraping {len(all_authors)} author profiles...")
-        author_db_ids = {}
 
-        for i, (uname, adata) in enumerate(all_authors.items()):
+        recent_authors = (
+            db.get_recent_authors(list(all_authors), config.AUTHOR_CACHE_TTL)
+            if config.AUTHOR_CACHE_TTL else {}
+        )
+        author_jobs = []
+        for uname, adata in all_authors.items():
+            if uname in recent_authors:
+                adata.update(recent_authors[uname])
+            else:
+                author_jobs.append((uname, adata))
+        if recent_authors:
+            log.info(f"  {len(recent_authors)} authors scraped recently, reusing stored profiles")
+        fetched_at = db.utc_now()
+
+        async def scrape_author(page, job):
+            uname, adata = job
             try:
                 profile = await scrape_author_profile(page, uname)
                 adata.update(profile)
+                adata["fetched_at"] = fetched_at
             except Exception as e:
                 log.warning(f"Error scraping author {uname}: {e}")
 
-            author_db_id = db.upsert_author(adata)
-            author_db_ids[uname] = author_db_id
-
-            stats = adata.get("stats", {})
-            for query, sdata in all_search_data.items():
-                db.upsert_author_snapshot(author_db_id, sdata["snapshot_id"], stats)
-                break  # one snapshot is enough for author stats
-
-            log.info(f"  [{i+1}/{len(all_authors)}] {adata.get('display_name', uname)}")
-
-        # 5. Save projects to DB
-        log.info("Saving projects to database...")
-        for pid, pdata in all_projects.items():
-            uname = pdata.get("author_username")
-            pdata["author_id"] = author_db_ids.get(uname)
-            pdata["behance_id"] = pid
+        await _run_pool(browser, author_jobs, scrape_author, "profiles")
 
-            project_db_id = db.upsert_project(pdata)
-            project_db_ids[pid] = project_db_id
+        author_db_ids = db.upsert_authors_many(list(all_authors.values()))
 
-            if pdata.get("tags"):
-                db.insert_project_tags(project_db_id, pdata["tags"])
+        # Author stats don't depend on the query; one snapshot is enough
+        if all_search_data:
+            first_snapshot_id = next(iter(all_search_data.values()))["snapshot_id"]
+            db.upsert_author_snapshots_many(
+                (author_db_ids[uname], first_snapshot_id, adata.get("stats", {}))
+                for uname, adata in all_authors.items()
+            )
 
-        # 6. Save search results to DB
-        log.info("Saving search results to database...")
-        for query, sdata in all_search_data.items():
-            for r in sdata["results"]:
-                pid = r["behance_id"]
-                db_project_id = project_db_ids.get(pid)
-                if not db_project_id:
-                    continue
-                db.insert_search_result(sdata["snapshot_id"], {
-                    "project_id": db_project_id,
-                    "position": r["position"],
-                    "appreciations": r.get("appreciations", 0),
-                    "views": r.get("views", 0),
-                    "comments": r.get("comments", 0),
-                    "is_promoted": r.get("is_promoted", 0),
-                    "is_featured": r.get("is_featured", 0),
-                    "cover_image_url": r.get("cover_image_url"),
-                })
+        # 5-6 run in one transaction: a single commit for the whole save
+        with db.transaction():
+            # 5. Save projects to DB
+            log.info("Saving projects to database...")
+            for pid, pdata in all_projects.items():
+                uname = pdata.get("author_username")
+                pdata["author_id"] = author_db_ids.get(uname)
+                pdata["behance_id"] = pid
+
+            project_db_ids = db.upsert_projects_many(list(all_projects.values()))
+            tag_rows = [
+                (project_db_ids[pid], tag)
+                for pid, pdata in all_projects.items()
+                for tag in pdata.get("tags") or ()
+            ]
+            db.insert_project_tags_many(tag_rows)
+
+            # 6. Save search results to DB
+            log.info("Saving search results to database...")
+            now = datetime.utcnow()
+            saved_results = 0
+            for query, sdata in all_search_data.items():
+                rows = []
+                for r in sdata["results"]:
+                    pid = r["behance_id"]
+                    db_project_id = project_db_ids.get(pid)
+                    if not db_project_id:
+                        continue
+                    appr = r.get("appreciations", 0)
+                    views = r.get("views", 0)
+                    rows.append({
+                        "project_id": db_project_id,
+                        "position": r["position"],
+                        "appreciations": appr,
+                        "views": views,
+                        "comments": r.get("comments", 0),
+                        "is_promoted": r.get("is_promoted", 0),
+                        "is_featured": r.get("is_featured", 0),
+                        "cover_image_url": r.get("cover_image_url"),
+                        **_engagement_metrics(
+                            appr, views, all_projects[pid].get("published_date"), now,
+                        ),
+                    })
+                db.insert_search_results_many(sdata["snapshot_id"], rows)
+                saved_results += len(rows)
+        log.info("Saved %d projects, %d tags, %d search results",
+                 len(project_db_ids), len(tag_rows), saved_results)
 
         # 7. Track experiment projects
         if config.TRACKED_PROJECTS:
             log.info(f"Tracking {len(config.TRACKED_PROJECTS)} experiment projects...")
-            await _track_experiment_projects(page, all_search_data)
-
-        await browser.close()
+            await _track_experiment_projects(browser, all_search_data)
 
     log.info("Full scrape completed!")
     return all_search_data
 
 
-async def _track_experiment_projects(page: Page, search_data: dict):
+# Everything tracking reads from a project page, reduced in the browser so
+# only small values come back instead of the whole HTML and body text.
+# Stats are matched against the <script> texts; "stats" is embedded nested
+# ({"appreciations":{"all":5},"views":{"all":39},...}) or flat
+# ({"appreciations":5,"views":39}); each entry is [appr, views].
+# published holds the body text after every "Published:" label, for
+# _PUBLISHED_RE; nums is the first numbers of the body text, only collected
+# for the log line when neither stats pattern matched.
+_TRACK_PAGE_JS = r"""() => {
+    const patterns = {
+        nested: /"stats"\s*:\s*\{\s*"appreciations"\s*:\s*\{\s*"all"\s*:\s*(\d+)\s*\}\s*,\s*"views"\s*:\s*\{\s*"all"\s*:\s*(\d+)\s*\}/,
+        flat: /"stats"\s*:\s*\{[^}]*"appreciations"\s*:\s*(\d+)[^}]*"views"\s*:\s*(\d+)/,
+        comments: /"commentCount"\s*:\s*(\d+)/,
+    };
+    const out = {nested: null, flat: null, comments: null};
+    for (const script of document.scripts) {
+        const text = script.textContent;
+        for (const [key, re] of Object.entries(patterns)) {
+            if (out[key] !== null) continue;
+            const m = re.exec(text);
+            if (m) out[key] = m.slice(1).map(Number);
+        }
+    }
+    const body = document.body ? document.body.innerText : "";
+    out.published = Array.from(
+        body.matchAll(/(?:Опубликовано|Published):/g), m => body.slice(m.index, m.index + 80)
+    ).join("\n");
+    out.nums = out.nested || out.flat
+        ? []
+        : Array.from(body.matchAll(/(\d[\d,.\s]*)\n/g), m => m[1]).slice(0, 10);
+    return out;
+}"""
+
+
+async def _track_experiment_projects(browser: Browser, search_data: dict):
     """Scrape current stats for tracked experiment projects and find their positions."""
-    from datetime import datetime
-
-    for tp in config.TRACKED_PROJECTS:
-        bid = tp.get("behance_id")
-        if not bid:
-            continue
-
+    tracked_at = db.utc_now()  # one timestamp for the whole batch
+    tracked_dt = datetime.fromisoformat(tracked_at)  # days_since_publish is measured from it
+    rows = []  # saved together once every tracked page is done
+    query_map = {"инфографика": "position_infografika", "дизайн карточек": "position_design_cards"}
+    # {query: {behance_id: position}}; reversed so the first hit wins
+    positions = {
+        query: {r["behance_id"]: r["position"] for r in reversed(sdata["results"])}
+        for query, sdata in search_data.items()
+        if query in query_map
+    }
+
+    async def track(page, tp):
+        bid = tp["behance_id"]
         label = tp.get("label", bid)
         url = tp.get("url") or f"{config.BEHANCE_BASE_URL}/gallery/{bid}/"
         log.info(f"  Tracking '{label}' ({bid})...")
@@ -982,54 +1241,34 @@ async def _track_experiment_projects(page: Page, search_data: dict):
         days_since = None
 
         try:
-            await page.goto(url, wait_until="networkidle", timeout=config.NAVIGATION_TIMEOUT)
-            await asyncio.sleep(_rand_delay())
-
-            page_html = await page.content()
+            # The stats JSON is in the initial HTML; the ready selector is for
+            # the body text the published date is read from
+            await _goto_ready(page, url, config.PROJECT_READY_SELECTOR)
 
             # Extract stats from embedded JSON — match the PROJECT-specific stats block
-            # Behance embeds: "stats":{"appreciations":{"all":5},"views":{"all":39},"comments":{"all":6}}
-            nested_stats = re.search(
-                r'"stats"\s*:\s*\{\s*"appreciations"\s*:\s*\{\s*"all"\s*:\s*(\d+)\s*\}\s*,\s*"views"\s*:\s*\{\s*"all"\s*:\s*(\d+)\s*\}',
-                page_html,
-            )
-            if nested_stats:
-                appr = int(nested_stats.group(1))
-                views = int(nested_stats.group(2))
-
-            comment_match = re.search(r'"commentCount"\s*:\s*(\d+)', page_html)
-            if comment_match:
-                comments = int(comment_match.group(1))
-
-            # Fallback: if nested stats not found, try flat format
-            if appr == 0 and views == 0:
-                flat_stats = re.search(
-                    r'"stats"\s*:\s*\{[^}]*"appreciations"\s*:\s*(\d+)[^}]*"views"\s*:\s*(\d+)',
-                    page_html,
-                )
-                if flat_stats:
-                    appr = int(flat_stats.group(1))
-                    views = int(flat_stats.group(2))
+            # A matched block counts even at 0/0: a new project can
+            # legitimately have no views yet
+            found = await page.evaluate(_TRACK_PAGE_JS)
+            stats = found["nested"] or found["flat"]  # flat format is the fallback
+            if stats:
+                appr, views = map(int, stats)
+
+            if found["comments"]:
+                comments = int(found["comments"][0])
 
             # Last resort fallback: parse from visible text on page
-            if appr == 0 and views == 0:
-                card_text = await page.inner_text("body")
+            if not stats:
                 # Behance shows "5\n39\n6" pattern near the stats area
                 # or we use the Published section numbers
-                date_nums = re.findall(r"(\d[\d,.\s]*)\n", card_text)
-                log.info(f"    Fallback text parse: first nums found = {date_nums[:10]}")
+                log.info(f"    Fallback text parse: first nums found = {found['nums']}")
 
             # Published date for days_since
-            card_text = await page.inner_text("body")
-            date_match = re.search(
-                r"(?:Опубликовано|Published):\s*(.+?\d{4})\s*г?\.?",
-                card_text,
-            )
+            date_match = _PUBLISHED_RE.search(found["published"])
             if date_match:
-                pub_date, _, _ = _parse_behance_date(date_match.group(0))
+                pub_date, _, _ = _parse_behance_date(date_match)
                 if pub_date:
-                    pub_dt = datetime.strptime(pub_date, "%Y-%m-%d")
-                    days_since = (datetime.utcnow() - pub_dt).total_seconds() / 86400
+                    pub_dt = datetime.fromisoformat(pub_date)
+                    days_since = (tracked_dt - pub_dt).total_seconds() / 86400
 
             log.info(f"    Parsed: appr={appr} views={views} comments={comments} days={days_since}")
 
@@ -1041,15 +1280,11 @@ async def _track_experiment_projects(page: Page, search_data: dict):
         pos_info["position_infografika"] = None
         pos_info["position_design_cards"] = None
 
-        query_map = {"инфографика": "position_infografika", "дизайн карточек": "position_design_cards"}
         for query, field in query_map.items():
-            if query in search_data:
-                for r in search_data[query]["results"]:
-                    if r["behance_id"] == bid:
-                        pos_info[field] = r["position"]
-                        break
+            if query in positions:
+                pos_info[field] = positions[query].get(bid)
 
-        db.insert_tracked_snapshot({
+        rows.append({
             "behance_id": bid,
             "label": label,
             "appreciations": appr,
@@ -1069,6 +1304,10 @@ async def _track_experiment_projects(page: Page, search_data: dict):
         log.info(f"    {label}: appr={appr} views={views} | "
                  f"{'FOUND: ' + ', '.join(found_in) if found_in else 'NOT in top-100'}")
 
+    tracked = [tp for tp in config.TRACKED_PROJECTS if tp.get("behance_id")]
+    await _run_pool(browser, tracked, track, "tracked projects")
+    db.insert_tracked_snapshots_many(rows, now=tracked_at)
+
 
 def run_scrape(queries=None, include_secondary=False):
     """Sync wrapper for run_full_scrape."""
@@ -1,12 +1,12 @@
 """Analyze thresholds: what numbers needed for each tier."""
-import sqlite3
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 for query in ["инфографика", "дизайн карточек"]:
     last_snap = conn.execute(
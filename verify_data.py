@@ -1,62 +1,92 @@
 """Verify data quality across all snapshots."""
-import sqlite3
 import os
 import sys
+from collections import defaultdict
+from itertools import groupby
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import db
 
-conn = sqlite3.connect(config.DB_PATH)
-conn.row_factory = sqlite3.Row
+conn = db.get_readonly_connection(immutable="--live" not in sys.argv)
 
 print("=" * 70)
 print("  DATA QUALITY VERIFICATION — ALL SNAPSHOTS")
 print("=" * 70)
 
-# 1. All snapshots
-snaps = conn.execute("SELECT * FROM snapshots ORDER BY id").fetchall()
+# 1. All snapshots, with their search result stats (section 3) joined in
+snaps = conn.execute("""
+    WITH sr_agg AS (
+        SELECT snapshot_id, COUNT(*) c, AVG(appreciations) avg_appr, AVG(views) avg_views,
+               SUM(appreciations = 0) zeros_appr, SUM(views = 0) zeros_views
+        FROM search_results
+        GROUP BY snapshot_id
+    )
+    SELECT s.*, COALESCE(sr_agg.c, 0) c,
+           COALESCE(sr_agg.avg_appr, 0.0) avg_appr, COALESCE(sr_agg.avg_views, 0.0) avg_views,
+           COALESCE(sr_agg.zeros_appr, 0) zeros_appr, COALESCE(sr_agg.zeros_views, 0) zeros_views
+    FROM snapshots s LEFT JOIN sr_agg ON sr_agg.snapshot_id = s.id
+    ORDER BY s.id
+""").fetchall()
 print(f"\n--- SNAPSHOTS ({len(snaps)} total) ---")
 for s in snaps:
     print(f"  #{s['id']}  {s['timestamp'][:16]}  query={s['query']!r:20}  collected={s['total_collected']}")
 
 # 2. Consistency: same number collected each time?
 print(f"\n--- CONSISTENCY CHECK ---")
-for query in ["инфографика", "дизайн карточек"]:
-    q_snaps = [s for s in snaps if s["query"] == query]
-    counts = [s["total_collected"] for s in q_snaps]
-    print(f"  '{query}': {len(q_snaps)} snapshots, collected: {counts}")
+check_queries = ["инфографика", "дизайн карточек"]
+collected = {
+    query: [r["total_collected"] for r in grp]
+    for query, grp in groupby(conn.execute(f"""
+        SELECT query, total_collected FROM snapshots
+        WHERE query IN ({",".join("?" * len(check_queries))})
+        ORDER BY query, id
+    """, check_queries), key=lambda r: r["query"])
+}
+for query in check_queries:
+    counts = collected.get(query, [])
+    print(f"  '{query}': {len(counts)} snapshots, collected: {counts}")
 
 # 3. Search results per snapshot
 print(f"\n--- SEARCH RESULTS PER SNAPSHOT ---")
 for s in snaps:
-    sr = conn.execute("SELECT COUNT(*) c, AVG(appreciations) avg_appr, AVG(views) avg_views FROM search_results WHERE snapshot_id=?", (s["id"],)).fetchone()
-    zeros_appr = conn.execute("SELECT COUNT(*) c FROM search_results WHERE snapshot_id=? AND appreciations=0", (s["id"],)).fetchone()["c"]
-    zeros_views = conn.execute("SELECT COUNT(*) c FROM search_results WHERE snapshot_id=? AND views=0", (s["id"],)).fetchone()["c"]
-    print(f"  Snap #{s['id']}: {sr['c']} results | avg_appr={sr['avg_appr']:.1f} avg_views={sr['avg_views']:.1f} | zero_appr={zeros_appr} zero_views={zeros_views}")
+    print(f"  Snap #{s['id']}: {s['c']} results | avg_appr={s['avg_appr']:.1f} avg_views={s['avg_views']:.1f} | zero_appr={s['zeros_appr']} zero_views={s['zeros_views']}")
 
 # 4. Compare top-5 across snapshots for same query
 print(f"\n--- TOP-5 STABILITY (инфографика) ---")
-inf_snaps = [s for s in snaps if s["query"] == "инфографика"]
-for s in inf_snaps[-3:]:
-    top5 = conn.execute("""
-        SELECT sr.position, sr.appreciations, sr.views, p.title, p.behance_id
+inf_snaps = conn.execute(
+    "SELECT id, timestamp FROM snapshots WHERE query = ? ORDER BY id DESC LIMIT 3",
+    ("инфографика",),
+).fetchall()[::-1]
+top5 = defaultdict(list)
+for r in conn.execute(f"""
+    SELECT * FROM (
+        SELECT sr.snapshot_id, sr.position, sr.appreciations, sr.views, p.title, p.behance_id,
+               ROW_NUMBER() OVER (PARTITION BY sr.snapshot_id ORDER BY sr.position) rn
         FROM search_results sr JOIN projects p ON sr.project_id=p.id
-        WHERE sr.snapshot_id=? ORDER BY sr.position LIMIT 5
-    """, (s["id"],)).fetchall()
+        WHERE sr.snapshot_id IN ({",".join("?" * len(inf_snaps))})
+    ) WHERE rn <= 5 ORDER BY snapshot_id, position
+""", [s["id"] for s in inf_snaps]):
+    top5[r["snapshot_id"]].append(r)
+for s in inf_snaps:
     print(f"\n  Snap #{s['id']} ({s['timestamp'][:16]}):")
-    for r in top5:
+    for r in top5[s["id"]]:
         print(f"    #{r['position']:>3} appr={r['appreciations']:>5} views={r['views']:>6} | {r['behance_id']} | {r['title'][:50]}")
 
 # 5. My projects
 print(f"\n--- MY PROJECTS ---")
 my = conn.execute("SELECT behance_id, title, published_date, module_count, title_keyword_match FROM projects WHERE is_my_project=1").fetchall()
 print(f"  Total: {len(my)}")
+in_search = defaultdict(list)
+for r in conn.execute(f"""
+    SELECT p.behance_id, sr.snapshot_id, sr.position FROM search_results sr
+    JOIN projects p ON sr.project_id=p.id
+    WHERE p.behance_id IN ({",".join("?" * len(my[:3]))})
+    ORDER BY sr.project_id, sr.snapshot_id
+""", [m["behance_id"] for m in my[:3]]):
+    in_search[r["behance_id"]].append(r)
 for m in my[:3]:
-    in_search = conn.execute("""
-        SELECT sr.snapshot_id, sr.position FROM search_results sr
-        JOIN projects p ON sr.project_id=p.id WHERE p.behance_id=?
-    """, (m["behance_id"],)).fetchall()
-    positions = [f"snap#{r['snapshot_id']}:#{r['position']}" for r in in_search]
+    positions = [f"snap#{r['snapshot_id']}:#{r['position']}" for r in in_search[m["behance_id"]]]
     print(f"  {m['title'][:50]} | date={m['published_date']} | kw={m['title_keyword_match']} | in_search: {positions or 'NONE'}")
 
 # 6. Author stats
@@ -69,25 +99,30 @@ top_authors = conn.execute("""
 for a in top_authors:
     print(f"  {a['username']:<25} views={a['total_views']:>8} appr={a['total_appreciations']:>6} followers={a['followers']:>5} loc={a['location']}")
 
+# 7-8 come from one query: date coverage over projects, and the trend
+# counts from one pass over the (project_id, snapshot_id) index
+# (project_id maps 1:1 to behance_id)
+with_date, total, unique_projects_in_search, multi_snapshot = conn.execute("""
+    SELECT with_date, total, unique_projects, multi_snapshot
+    FROM (
+        SELECT COUNT(*) total, COALESCE(SUM(published_date IS NOT NULL), 0) with_date
+        FROM projects
+    ), (
+        SELECT COUNT(*) unique_projects, COALESCE(SUM(snap_count > 1), 0) multi_snapshot
+        FROM (
+            SELECT project_id, COUNT(DISTINCT snapshot_id) as snap_count
+            FROM search_results
+            GROUP BY project_id
+        )
+    )
+""").fetchone()
+
 # 7. Dates
 print(f"\n--- DATE COVERAGE ---")
-with_date = conn.execute("SELECT COUNT(*) c FROM projects WHERE published_date IS NOT NULL").fetchone()["c"]
-total = conn.execute("SELECT COUNT(*) c FROM projects").fetchone()["c"]
 print(f"  Projects with date: {with_date}/{total}")
 
 # 8. Trend data available?
 print(f"\n--- TREND DATA ---")
-unique_projects_in_search = conn.execute("""
-    SELECT COUNT(DISTINCT p.behance_id) c FROM search_results sr
-    JOIN projects p ON sr.project_id=p.id
-""").fetchone()["c"]
-multi_snapshot = conn.execute("""
-    SELECT COUNT(*) c FROM (
-        SELECT p.behance_id, COUNT(DISTINCT sr.snapshot_id) as snap_count
-        FROM search_results sr JOIN projects p ON sr.project_id=p.id
-        GROUP BY p.behance_id HAVING snap_count > 1
-    )
-""").fetchone()["c"]
 print(f"  Unique projects ever in search: {unique_projects_in_search}")
 print(f"  Projects in 2+ snapshots (trackable trends): {multi_snapshot}")
 
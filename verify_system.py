@@ -24,11 +24,13 @@ missing = [t for t in expected if t not in tables]
 print(f"    Missing: {missing or 'NONE - all OK'}")
 
 # 2. Data counts
-sn = conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
-pr = conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
-sr = conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
-au = conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
-ts = conn.execute("SELECT COUNT(*) FROM tracked_snapshots").fetchone()[0]
+sn, pr, sr, au, ts = conn.execute("""
+    SELECT (SELECT COUNT(*) FROM snapshots),
+           (SELECT COUNT(*) FROM projects),
+           (SELECT COUNT(*) FROM search_results),
+           (SELECT COUNT(*) FROM authors),
+           (SELECT COUNT(*) FROM tracked_snapshots)
+""").fetchone()
 print(f"\n[2] Data: snapshots={sn} projects={pr} search_results={sr} authors={au} tracked={ts}")
 
 # 3. Cron